@@ -0,0 +1,35 @@
+"""Measure solve_many throughput across worker counts and list the most expensive puzzles."""
+import argparse
+import os
+import time
+
+from corpus import PUZZLES, parse_puzzle
+
+from backend.sudoku_solver import solve_many
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--copies', type=int, default=250, help="times the corpus is repeated")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--chunksize', type=int, default=16)
+    parser.add_argument('--top', type=int, default=3, help="number of slowest puzzles to list")
+    args = parser.parse_args()
+
+    corpus = [parse_puzzle(puzzle) for puzzles in PUZZLES.values() for puzzle in puzzles]
+    puzzles = corpus * args.copies
+
+    for workers in args.workers:
+        start = time.perf_counter()
+        results = list(solve_many(puzzles, workers=workers, chunksize=args.chunksize))
+        elapsed = time.perf_counter() - start
+        print(f"workers={workers:<3} {len(results)} puzzles in {elapsed:.2f}s "
+              f"({len(results) / elapsed:,.0f} solves/s)")
+
+    print("\nSlowest puzzles (last run):")
+    for result in sorted(results, key=lambda r: r.seconds, reverse=True)[:args.top]:
+        print(f"  #{result.index:<6} {result.seconds * 1000:8.3f} ms  {result.nodes:>6} nodes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Compare commit and verify throughput of the legacy and binary ZeroKnowledgeProof commitment modes."""
+import argparse
+import time
+
+from corpus import PUZZLES, parse_puzzle
+
+from backend.sudoku_solver import SudokuSolver
+from backend.zkp_protocol import COMMITMENT_MODES, ZeroKnowledgeProof
+
+SELECTIONS = [(selection_type, index) for selection_type in ('row', 'column', 'grid') for index in range(9)]
+
+
+def bench_mode(mode, puzzle, solution, proofs):
+    zkp = ZeroKnowledgeProof(puzzle, solution, commitment=mode)
+
+    start = time.perf_counter()
+    for _ in range(proofs):
+        zkp.commitments = zkp.generate_commitments()
+    commit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(proofs):
+        for selection_type, index in SELECTIONS:
+            assert zkp.verify_complete_selection(selection_type, index)
+    verify_time = time.perf_counter() - start
+
+    return proofs * 81 / commit_time, proofs * 81 * 3 / verify_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--proofs', type=int, default=500, help="commitment sets generated and verified per mode")
+    args = parser.parse_args()
+
+    puzzle = parse_puzzle(PUZZLES['hard'][0])
+    solution = SudokuSolver(parse_puzzle(PUZZLES['hard'][0]), 'propagate').get_solved_board()
+
+    rates = {}
+    for mode in COMMITMENT_MODES:
+        rates[mode] = bench_mode(mode, puzzle, solution, args.proofs)
+        commit_rate, verify_rate = rates[mode]
+        print(f"{mode:<8} commit {commit_rate:>12,.0f} cells/s   verify {verify_rate:>12,.0f} cells/s")
+    print(f"speedup  commit {rates['binary'][0] / rates['legacy'][0]:>11.1f}x   "
+          f"verify {rates['binary'][1] / rates['legacy'][1]:>11.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""Compare full-grid throughput of the PuzzleGenerator backtracking and transform modes."""
+import argparse
+import time
+
+import corpus  # noqa: F401  (puts src/ on sys.path)
+
+from backend.puzzle_generator import PuzzleGenerator
+
+
+def grids_per_second(mode, count, seed):
+    generator = PuzzleGenerator(mode, seed=seed)
+    start = time.perf_counter()
+    for _ in range(count):
+        generator.grid = [[0 for _ in range(9)] for _ in range(9)]
+        generator.generate_full_solution()
+    elapsed = time.perf_counter() - start
+    return count / elapsed, elapsed / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200, help="grids generated per mode")
+    parser.add_argument('--seed', type=int, default=2024)
+    args = parser.parse_args()
+
+    results = {}
+    for mode, count in (('backtrack', args.count), ('transform', args.count * 100)):
+        rate, per_grid = grids_per_second(mode, count, args.seed)
+        results[mode] = rate
+        print(f"{mode:<10} {count:>7} grids  {rate:>12,.0f} grids/s  {per_grid * 1e6:>10.1f} us/grid")
+    print(f"speedup    {results['transform'] / results['backtrack']:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
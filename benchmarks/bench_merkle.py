@@ -0,0 +1,77 @@
+"""Compare verifier I/O and throughput of the flat commitment dict and the Merkle commitment root."""
+import argparse
+import time
+
+from corpus import PUZZLES, parse_puzzle
+
+from backend.noninteractive import prove
+from backend.sudoku_solver import SudokuSolver
+from backend.zkp_protocol import DIGEST_SIZE, ZeroKnowledgeProof
+
+# The run_zkp schedule: 8 of the 9 indexes for every selection type
+SELECTIONS = [(selection_type, index) for selection_type in ('row', 'column', 'grid') for index in range(8)]
+
+
+def flat_bytes(zkp):
+    # Every commitment is published up front and the selected ones are shipped again per opening.
+    # Counted as raw 32-byte digests, like the Merkle nodes, not as the legacy hex strings.
+    published = len(zkp.commitments) * DIGEST_SIZE
+    shipped = sum(len(zkp.select_cards_for_selection(*selection)) for selection in SELECTIONS) * DIGEST_SIZE
+    return published + shipped
+
+
+def merkle_bytes(zkp, combined=False):
+    cells = [[i * 9 + j for _, _, (i, j) in zkp.select_cards_for_selection(*selection)] for selection in SELECTIONS]
+    if combined:
+        # One multi-proof for every opening of the run, so nodes shared between openings go out once
+        cells = [[idx for opened in cells for idx in opened]]
+    return len(zkp.merkle_root) + sum(DIGEST_SIZE * len(zkp.merkle_tree.prove(opened)) for opened in cells)
+
+
+def relative_size(flat, merkle):
+    if merkle <= flat:
+        return f"merkle {flat / merkle:.1f}x smaller"
+    return f"merkle {merkle / flat:.1f}x larger"
+
+
+def proofs_per_second(puzzle, solution, count, **options):
+    start = time.perf_counter()
+    for _ in range(count):
+        zkp = ZeroKnowledgeProof(puzzle, solution, **options)
+        for selection in SELECTIONS:
+            opened = zkp.select_cards_for_selection(*selection)
+            if zkp.merkle_tree:
+                nodes = zkp.merkle_tree.prove([i * 9 + j for _, _, (i, j) in opened])
+                assert zkp.verify_merkle_selection(opened, nodes)
+            else:
+                assert all(zkp.verify_selection(card) for card in opened)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200, help="proofs per configuration")
+    args = parser.parse_args()
+
+    puzzle = parse_puzzle(PUZZLES['hard'][0])
+    solution = SudokuSolver(parse_puzzle(PUZZLES['hard'][0]), 'propagate').get_solved_board()
+
+    flat = flat_bytes(ZeroKnowledgeProof(puzzle, solution))
+    zkp = ZeroKnowledgeProof(puzzle, solution, merkle=True)
+    for label, merkle in (('per opening', merkle_bytes(zkp)), ('per run', merkle_bytes(zkp, combined=True))):
+        print(f"verifier bytes per proof   flat dict {flat:>8,}   merkle {label:<12}{merkle:>8,}   "
+              f"({relative_size(flat, merkle)})")
+
+    for commitment in ('legacy', 'binary'):
+        flat_rate = proofs_per_second(puzzle, solution, args.count, commitment=commitment)
+        merkle_rate = proofs_per_second(puzzle, solution, args.count, commitment=commitment, merkle=True)
+        print(f"{commitment:<7} proofs/s            flat dict {flat_rate:>8,.0f}   merkle {merkle_rate:>8,.0f}")
+
+    flat_proof = len(prove(puzzle, solution, merkle=False))
+    merkle_proof = len(prove(puzzle, solution, merkle=True))
+    print(f"non-interactive 2^-40 proof flat {flat_proof:>10,} B   merkle {merkle_proof:>10,} B   "
+          f"({relative_size(flat_proof, merkle_proof)})")
+
+
+if __name__ == '__main__':
+    main()
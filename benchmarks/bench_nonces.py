@@ -0,0 +1,37 @@
+"""Compare nonce generation throughput: Mersenne Twister integers against the pooled os.urandom source."""
+import argparse
+import os
+import random
+import time
+
+import corpus  # noqa: F401  (puts src/ on sys.path)
+
+from backend.nonce_pool import NONCE_SIZE, NoncePool
+from backend.zkp_protocol import ZeroKnowledgeProof
+
+
+def rate(label, make_proof_nonces, proofs):
+    start = time.perf_counter()
+    for _ in range(proofs):
+        make_proof_nonces()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {proofs * 81 / elapsed:>14,.0f} nonces/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--proofs', type=int, default=5000)
+    args = parser.parse_args()
+
+    rate("getrandbits(256) ints (old)", lambda: [[random.getrandbits(256) for _ in range(9)] for _ in range(9)],
+         args.proofs)
+    rate("os.urandom(32) per nonce", lambda: [[os.urandom(NONCE_SIZE) for _ in range(9)] for _ in range(9)],
+         args.proofs)
+    pool = NoncePool(background=False)
+    rate("NoncePool.take() (raw block)", pool.take, args.proofs)
+    rate("generate_nonces(binary=True)", lambda: ZeroKnowledgeProof.generate_nonces(binary=True), args.proofs)
+    rate("generate_nonces() (legacy ints)", ZeroKnowledgeProof.generate_nonces, args.proofs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""Record proof size and prove/verify time of the non-interactive (Fiat-Shamir) proof mode."""
+import argparse
+import time
+
+from corpus import PUZZLES, parse_puzzle
+
+from backend.noninteractive import prove, verify
+from backend.proof_runner import rounds_for_soundness
+from backend.sudoku_solver import SudokuSolver
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--bits', type=int, nargs='+', default=[10, 20, 40],
+                        help="soundness targets as powers of two, 40 means an error of 2^-40")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    puzzle = parse_puzzle(PUZZLES['hard'][0])
+    solution = SudokuSolver(parse_puzzle(PUZZLES['hard'][0]), 'propagate').get_solved_board()
+
+    print(f"{'soundness':>10}{'rounds':>8}{'size (KiB)':>12}{'prove (ms)':>12}{'verify (ms)':>13}")
+    for bits in args.bits:
+        prove_time = verify_time = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            proof = prove(puzzle, solution, soundness=2 ** -bits)
+            prove_time = min(prove_time, time.perf_counter() - start)
+            start = time.perf_counter()
+            assert verify(puzzle, proof, soundness=2 ** -bits)
+            verify_time = min(verify_time, time.perf_counter() - start)
+        print(f"{'2^-' + str(bits):>10}{rounds_for_soundness(2 ** -bits):>8}{len(proof) / 1024:>12.1f}"
+              f"{prove_time * 1000:>12.1f}{verify_time * 1000:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
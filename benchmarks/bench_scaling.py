@@ -0,0 +1,93 @@
+"""
+Report solve and proof cost, time and peak memory, as the board grows from 9x9 to 16x16 and 25x25.
+
+'prove' is one commitment opened on the run_zkp schedule (side - 1 units of each type), 'amplified'
+the full multi-round ProofRunner proof at the --soundness-bits target, run in this process.
+"""
+import argparse
+import time
+import tracemalloc
+
+import corpus  # noqa: F401  (puts src/ on sys.path)
+
+from backend.proof_runner import ProofRunner
+from backend.puzzle_generator import PuzzleGenerator
+from backend.sudoku_solver import SudokuSolver
+from backend.zkp_protocol import COMMITMENT_MODES, ZeroKnowledgeProof
+
+
+def best_of(repeat, func):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_kib(func):
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--box-sizes', type=int, nargs='+', default=[3, 4, 5], choices=[2, 3, 4, 5])
+    # Randomly carved 'hard' 25x25 boards sit near the hardness peak of exact cover search and can
+    # take minutes to solve, so the default stays at 'medium'
+    parser.add_argument('--level', choices=['easy', 'medium', 'hard'], default='medium')
+    parser.add_argument('--unique', action='store_true',
+                        help="carve puzzles with a unique solution (slow from 16x16 up)")
+    parser.add_argument('--commitment', choices=COMMITMENT_MODES, default='binary')
+    parser.add_argument('--merkle', action='store_true', help="add the Merkle commitment layer")
+    parser.add_argument('--soundness-bits', type=int, default=40, help="soundness error of the amplified proof")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per measurement, the best time is reported")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'board':<8}{'clues':>6}{'solve (ms)':>12}{'nodes':>8}{'commit (ms)':>13}{'prove (ms)':>12}"
+          f"{'openings':>10}{'amplified (ms)':>16}{'rounds':>8}{'solve KiB':>11}{'prove KiB':>11}")
+    for box_size in args.box_sizes:
+        side = box_size * box_size
+        generator = PuzzleGenerator(seed=args.seed, box_size=box_size)
+        puzzle = generator.generate(args.level, unique=args.unique)
+        clues = sum(1 for row in puzzle for value in row if value)
+
+        def solve():
+            solver = SudokuSolver([row[:] for row in puzzle], 'dlx')
+            solver.solve()
+            return solver
+
+        solve_time, solver = best_of(args.repeat, solve)
+        solution = solver.board
+
+        def commit():
+            return ZeroKnowledgeProof(puzzle, solution, args.commitment, args.merkle)
+
+        def run_proof():
+            zkp = commit()
+            results = list(zkp.stream_results())
+            assert all(record.verified for record in results)
+            return results
+
+        def run_amplified():
+            report = ProofRunner(puzzle, solution, 2.0 ** -args.soundness_bits, workers=1, executor='thread',
+                                 commitment=args.commitment).run()
+            assert report.accepted
+            return report
+
+        commit_time, _ = best_of(args.repeat, commit)
+        prove_time, records = best_of(args.repeat, run_proof)
+        amplified_time, report = best_of(args.repeat, run_amplified)
+        print(f"{f'{side}x{side}':<8}{clues:>6}{solve_time * 1000:>12.2f}{solver.nodes:>8}"
+              f"{commit_time * 1000:>13.2f}{prove_time * 1000:>12.2f}{len(records):>10}"
+              f"{amplified_time * 1000:>16.1f}{report.rounds:>8}"
+              f"{peak_kib(solve):>11,.0f}{peak_kib(run_proof):>11,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Loopback load generator for the asyncio prover/verifier service."""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from corpus import PUZZLES, parse_puzzle
+
+from backend.zkp_service import ProverServer, VerifierClient
+
+
+async def run_load(sessions, concurrency, soundness, unix):
+    path = os.path.join(tempfile.mkdtemp(), 'prover.sock') if unix else None
+    puzzles = [parse_puzzle(puzzle) for level in PUZZLES.values() for puzzle in level]
+
+    async with ProverServer(path=path, max_sessions=concurrency) as server:
+        client = VerifierClient(port=server.port, path=path)
+        limit = asyncio.Semaphore(concurrency)
+        latencies = []
+
+        async def session(number):
+            async with limit:
+                start = time.perf_counter()
+                assert await client.verify(puzzles[number % len(puzzles)], soundness)
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(session(number) for number in range(sessions)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    transport = 'unix' if unix else 'tcp'
+    print(f"{transport:<5} {sessions} sessions, {concurrency} concurrent: {sessions / elapsed:,.1f} sessions/s  "
+          f"p50 {p50 * 1000:.1f} ms  p99 {p99 * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--bits', type=int, default=10, help="soundness target 2^-bits per session")
+    parser.add_argument('--unix', action='store_true', help="use a Unix socket instead of TCP")
+    args = parser.parse_args()
+    asyncio.run(run_load(args.sessions, args.concurrency, 2 ** -args.bits, args.unix))
+
+
+if __name__ == '__main__':
+    main()
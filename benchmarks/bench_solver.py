@@ -0,0 +1,38 @@
+"""Compare the SudokuSolver engines on the fixed puzzle corpus."""
+import argparse
+import time
+
+from corpus import PUZZLES, parse_puzzle
+
+from backend.sudoku_solver import SudokuSolver
+
+
+def time_engine(engine, puzzle, repeat):
+    best = float('inf')
+    board = None
+    for _ in range(repeat):
+        board = parse_puzzle(puzzle)
+        solver = SudokuSolver(board, engine)
+        start = time.perf_counter()
+        solver.solve()
+        best = min(best, time.perf_counter() - start)
+    return best, board
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=3, help="runs per puzzle, the best time is reported")
+    parser.add_argument('--levels', nargs='+', default=list(PUZZLES), choices=list(PUZZLES))
+    args = parser.parse_args()
+
+    print(f"{'level':<12}{'#':>3}{'backtrack (ms)':>17}{'propagate (ms)':>17}{'speedup':>10}  same")
+    for level in args.levels:
+        for number, puzzle in enumerate(PUZZLES[level]):
+            slow, slow_board = time_engine('backtrack', puzzle, args.repeat)
+            fast, fast_board = time_engine('propagate', puzzle, args.repeat)
+            print(f"{level:<12}{number:>3}{slow * 1000:>17.3f}{fast * 1000:>17.3f}"
+                  f"{slow / fast:>9.1f}x  {slow_board == fast_board}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+import os
+import sys
+
+# Make the backend package importable when the benchmarks are run as plain scripts
+current_script_path = os.path.abspath(__file__)
+project_root_path = os.path.dirname(os.path.dirname(current_script_path))
+src_path = os.path.join(project_root_path, 'src')
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+# Fixed puzzles in 81-character form, '.' or '0' marks an empty cell.
+# Every puzzle here has a unique solution.
+PUZZLES = {
+    'easy': [
+        "003020600900305001001806400008102900700000008006708200002609500800203009005010300",
+        "200080300060070084030500209000105408000000000402706000301007040720040060004010003",
+    ],
+    'medium': [
+        "000000907000420180000705026100904000050000040000507009920108000034059000507000000",
+        "030050040008010500460000012070502080000603000040109030250000098001020600080060020",
+    ],
+    'hard': [
+        "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..",
+        "..53.....8......2..7..1.5..4....53...1..7...6..32...8..6.5....9..4....3......97..",
+    ],
+    # Puzzles that force the naive backtracker through a very large search tree
+    'adversarial': [
+        "85...24..72......9..4.........1.7..23.5...9...4...........8..7..17..........36.4.",
+        "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+    ],
+}
+
+# Known worst cases for the naive backtracker: it needs a minute or more on each of these, so they
+# are kept out of PUZZLES and only timed with the naive engine on request. Both have a unique solution.
+NAIVE_WORST = [
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9",
+]
+
+# Generated once from PuzzleGenerator (seeds 1001-1003) and frozen, so a change to the generator
+# cannot change what the solver and ZKP benchmarks measure. 50 puzzles per level.
+GENERATED = {
+    'easy': [
+        "3.26547818..1.3.4.1472..3.547.8165299214.5876658.2.1..2867914.3.39542618514.68..7",
+        "9684125374527...1837195846.5.769..84..38.41251845.36.974.3.5..1.15269743.39.4.856",
+        ".264..7895.1387426.742.935.1638745927.56921..9.21538.7257.3.6.44.8..6.35639541.78",
+        "1764583.9398......4.56.9817563..1248.893461757.1..26939.4865732837214956.52.73..1",
+        "9786352416.54..79..1.297856594.763..73.5824698..3495171..82397535.9.4.822897..63.",
+        ".57826.418623.4795143975682214.9.86369..3.12..782619.4.2965.4184..18257..8..49.36",
+        "95.82.147.187652397.2..9.68.7.298354849536712..5147.9.1..6.247.584.716.3.67354981",
+        "3697214.5.27..53.15.8436.97..6274153.7561..491.3859672.31547926794.62.186.2.98.3.",
+        "48.53.....768294.393264.8.73.879.54.759.18236214.657.88.397612562.184379197..3.84",
+        "1.763.548.85714.3993.8..6.18412..397..61438.225397816.37.59.42651942.78.462.8.915",
+        "75284..36...2351788136.9245927.635815.6...423..152.7691.578.6.2.781963546943..817",
+        ".2.5314.835198.2.6.847.61....561392.26784.53.13927.8644..1.73.557349.612618352749",
+        "812647395376859.1254.132.86481..5.2379.2846.1265...874658....47.345..26992741..38",
+        ".398.71427..3425694.6..537881247695...79.82.69.5.3.78415862943.693.1.825274583.9.",
+        "71.63.24...5249.7..42178.561.83274.9496581732273.641.55.7.926.4961453827.2.7.65.3",
+        "15698724..4361285.9284..716.1789..25..4735961..5261478.62.4.1.7..157.692879126.34",
+        "..1..53...56.498719837165..6729.3.458341.2..919..6728356923.417.1.674952427591638",
+        "7483652.92.571...3931428567.7.143628683952.4....876.351..2378943.7684.5282.5.13.6",
+        ".73.6125454.87.1699..452738.97518423....34.97234.9658132..879.5.856493..419325.76",
+        "81.2.57..95..7314837681..9569.58241742.3.7.5958794.3.2238459.71.45726.83.69..8524",
+        "54216897.876.49152.31725.4.698...7214.781.539.1..9..841...5..67769483215253671498",
+        "1.6.834754.95172.88576429135.3.26.916.2.59384..4738.26.6.2.4.59741.95632.9.36184.",
+        "821635974..3897152.5912.683.48.612373..5..491192.7.568..5.4..26637.1984528..56719",
+        ".736.41...8.1..769.9.2783544.753291885.461.73312789.45735826491.48317.2662.9.5..7",
+        "41527.98683219645779684..2.16.73..92.739.1...9.846.371587314269.21...73..49627815",
+        "4.35178...954862318..9.35.7.74.5861.682194.53531762498.4.275186258.3197..67.493..",
+        "6.93482514859..63713276.849796.2148..2467.91..1389.7.2.6.4375..25718639..4.2.9176",
+        "3218579.44.6219385598.4.1.7.4...671.2394716581.7.982436..932.7.7.3.64592.12785.36",
+        "47259638..58.13..436187.592.84932.157356419.8..978.43.84.169.532163..849.93428..7",
+        "76.253.1.915486273.24197.8.54...81361873.2..4639.148274.1.253.825.839.4..93741562",
+        "157.629842385947.1.46.8..35.918.35423.41256.85.26491737.34...29469.1.3.782.93.416",
+        ".5..1743.7839.51262.4638..59...628.44.85.37615.1874.923924516871..386249.46729.13",
+        "14895.6.7273146.95965...214387...5626517.39.8.9268517.83.591.2.72.8643..51623.489",
+        "5726...8..64.3892739824716.4..7.325995712.638...956741281475.96.4539.872.3986.51.",
+        "7..825439.8.3971.5.59.14728418.562.3627.39851.35..1.74.7.9425.6846.7391..92168347",
+        "5.29814.77.146325..942.71.6.396.571827581496...6..9542.235486716...7.3941473968.5",
+        "74.5382.62394.1.5.56827931415.9.3.429867.25..423.15.79.14356.2.37.8.41656.51274.3",
+        ".817926.32...847919576.12.83749581.6198426.37.2531.9.4516.49.72.4..63815832175...",
+        "...47.261.479.15..6.152849.37..598...56814732.84.37956719.82645825.46.79463795128",
+        ".6549.872248671..9793..541648672..51...51.7..5173..294321.56947.7493218.8591476.3",
+        "891.74.52.63...78......6314.2764389598.51.236356982147.497.1568618.59..3735468921",
+        "4..69857.397512846...3.4.9.5.41.762917294635863..85.1.9187234657534..28..4685.937",
+        "9386217546.74....3.4.8736191.2367498.6495237.3791.82.578.23.54.5.6.841324.3..6987",
+        "98156.432.4.93281532584.79657..94.834..3259.11937.6.5473425.1.92.96.3.48.56.19.27",
+        "91.5867..42691785.7.843..69162.4..985892613.43.4.5962124.3..916891.2.4.7.37194285",
+        "518.73.949.728.136263.9187565.9.4.81.9185764278416.359...7.95288.95.6.134..3189.7",
+        ".73.495685.82367946.4875312451392..7327618....697541.3.4.9872..93.421.767...63941",
+        "2.17.46.3763918..558463291713624..78852..6194..75.123.475123869.18.97.5232..657..",
+        ".2365..9.457982..6689341....38415.6956479813279..3648.342..96588.652394.915864..3",
+        "..94758164.12..5.7.57613.94.83127.6992..3.78171698435.6783.91253.275..48145862.7.",
+    ],
+    'medium': [
+        "43...52...273.4.8..1.927..4962.3851.3.1...82.5781.23..7.4.931.2....764...8654.7.3",
+        ".31.....747623..985.8..6234354.9.861...8....3.1.6.3572.274..3.56..52...99.531.4.6",
+        "..7.364.16.5.8...2.4...26.39..348576.736159...6492...8..1...8.94268791...89451...",
+        "4...3285...64.9..3923581467..5.43982..4.2.631..9.1...46.12.7.9.3.......5.583.4216",
+        ".95.623...2...891.368..9.2.4.63.7..557982.1.32.1954...84269..3.....71862...2.345.",
+        "813....9..6..352..925.18...1862.39.4.59..1728..78.93164.8..2...691....4.532146..9",
+        "62..7139.1.9....5.5.8932...4......2.95.21846776249.1.5345..6..921..8...6.9674.23.",
+        "943.1..2..5..8..74..845.631.1.8....9...1.53.7589273..6...9384..8.254..6313472..98",
+        "2.19.8.67.5.2.3.186984..2538..14.3753..7.2846476.8...2.....4.......3...4547829.31",
+        ".417.283...854.612.....875.1.69..425.542.6183.82.....6..582.3.1.2..345988..6..2.7",
+        "159.87...78345261......35.7275..8..19..57.83..3124....596...1.33..7.69454.79..26.",
+        "9.5...16336.5.....172..68.4721...435.3.15.6..4...72.185984..3.664379.2.1.1..635..",
+        "...6734..947.2..6..36459.17....4.92...92.574626491.3....3894..2.785.2..9.9.7.1.54",
+        ".37....9.82.3475.114.....7829..841376.4.13.25..3.2..46..84.6.19961..57...7.1..653",
+        ".57..6921.8..52634.2.1..78......83....54218962..9.34...9623417.87.695.4334.....6.",
+        "..8214...631.7..84..98.65..96...8.7.87.36..9121.9.78...427..9.63.76.5.485.6..1723",
+        ".6528..9384..732..23.65.184....96..151873....976.15..86.154.9.2.5.928.1...2..1.5.",
+        ".294.13......39.4.34.8269.7...64.875.5.....697.29.841329416.7.8.7...3..4.3.79.521",
+        "...57....1..89.5.684..3.72.4..386....582..3..7.3945812671.53298..41..67.239..81.5",
+        "..49.317.8391.76.4...45..2.14.835..7.872.6.3.....4986.56.3817..49..72..6.1..94.82",
+        "58..491..67.5.18.9...3.725.39.2...6.1589.4.2...6..85...298.631.4.5.739.283..926.5",
+        "...4..17...4...59838957.6.443...78.56.13..24787.6.4.1.5.3.62.8.1.87.3..292..154.6",
+        "..8179..4.71...82.64.....1..8439756256.8....12.351..8773.925.484.27.1.96..9.6.2..",
+        "4.3.86.9.9.7...8.41684.5273.84.371..371..864..95....38.46.1..5.5....3987.3.5724..",
+        "21.7..........81.5485.1.27.364189.27751..2..98..57.361.4..967.2..6...45.13.4576.8",
+        "375..1.4694.67..3..62..35.74.356728.1..4..7.37.6.....55...1..7868.3591.42..786..9",
+        ".95.14.8...693845..48...7.94.23578...17.49.35.3986.2.........239.16.3.74753...168",
+        ".2..697.4371...9..94.3.5.2.793.5461.2.5891.7..84..75.2..9.421676.7.832.5...7...8.",
+        ".9.2.6.5.782..396.1..97432.81.74.6..6.4...7.935.1.94.2941....76.38.9.24..764...93",
+        ".21.4796.687.952.145..62.37.64..85....862..7.712..........397161.358.492..6..135.",
+        ".6.4..35.7..5814.2.153...98.217.5.46..6832..558.61.2..6.3.4.9172.41...8.1..95.6.4",
+        "58.2.431.3....1.45..638597.9.87.64...654.97..1..82.5...49.67.5.6.35.8.9....932684",
+        "41..76.39.6.18.74..79..26.19.37..1.8.2.4.3.....6.18.2.2946...131..234..6.378.1452",
+        "6..3.5.173.268149..1...436.2..43..784.82..63.5.7.689249547.6..3......759.83..2.4.",
+        "54.7.2186.1..5..7.637.8..2...4298715.91.4.862..51..94.4...15.9.1..4.9..79..876.51",
+        "26.3.4.958.96..3..35...1..6126.3..47.3.16.2.979.4.2...9.25.67.8673218..44...936..",
+        ".25.74.3.6.81..5....43.896249.82531681...725425.413879..1589....692.....5....6...",
+        "..6...81..586.1.....98.7.659.71.4.3858437...13.295.64..9.7823...754..98...356.172",
+        "..294..8..9.2673.4.4.51....26187594..376..8.1...134.72.547921.6.7......832.4.1.95",
+        "913.687.575...9....68.5.43.479.8.25.6.1.7.8...8291...632684591789.1..5..1.....6.2",
+        "95.7214..7439.6.21..684.7.9.61.72.984.2...31.8..13..46289.1.6....7.6..3..3..9718.",
+        ".168..49..3461975...52.3.6.4279..3..16..325.9.9.1.4....415...2...24719357...26.14",
+        "..9241836.2.7.594..46...752...8..17.....9.364.9361728...14765.....15.6986.5..84.7",
+        "7..6.849.469....81.8594...3.17..92345.84......9.172.682...9685.85.7...16.7.8.1342",
+        ".53.74.68..785..3.98....54.8367.54.152.6....3.9418.6.5.....6.8.345.987.66184...52",
+        "428.13.7996.2.415.15..7..24..16274..2.513.....3.45829.57..619.....745.12.1.8....7",
+        "..9...7..5..94..8.832..69...98351.46...6..3956.32.481798641..7321.73.46..4.56...8",
+        "7.3.......2.834.5...19..326...68..74397.4.8.286.72.135....926872364..5199.85.1..3",
+        ".7.2.41..2396187.5..13752.6.6.4.782..82.5..3.713..6.5.69......2.24.69578.5.742...",
+        "72..4.59.1.8..9472.4.723..6674538..18....6...29.17..8.4.731..695.29.7.3.319.6.7..",
+    ],
+    'hard': [
+        ".5....6.4.2984...534..2....5.4.92..8..358..12.....4..39..2.3...4.59......6.....8.",
+        "..6..8.53.1....87..4..736..9...3.5..6.2....3...3.2...782.359.1.....47.82......9..",
+        "....684....4752...65....2...2..94.3.....2..59....1.7.2.4..8..1.81...6....3.5.19.6",
+        ".5.7..4.97....4.3.294..5.7.5..6....24.65..9.7...2..1..9..45...8.1....7..6..8...5.",
+        "3......687...2.4....468..39..79.18..8....4.....9.3.....21....8..7..4.9.648..92.1.",
+        ".....89..5..3762....259.1.3.25...6.....95.3.2.....2....94..153.13.6....9.5.....7.",
+        "..39..4..457..86.......4..5...5.9.3..316.....8..3...2..2..6.7...784..2...96.12..8",
+        ".6.51.............751....2.4...72.9..9.3564......41.5....23...9.72....6.9.3.85.47",
+        ".6241..93.9452....1.....5.....7..8.4..7.5..6....1...37......9...5.649...9...7.486",
+        "....813......5.71.....4...696..78....85....6...1.6...55...1...81784...5.34.8..19.",
+        "......5.99..4..8.2.8391..4...5.....8..8..12...1.5...7.5.6.87...837629..........86",
+        "....34....5.2..643.6.57...1.9.....7..76.4.35..3276.4....5..29..32...67.5.........",
+        "....9..2...35.46.7.....6.344..35....18...23..5.....46.864.2..7..756..8...1.....5.",
+        "...9.8.......3.....6815.279.37....1.846..5.9..5...97.6..1..368...3..24..4.5......",
+        "8..7.3.9....9625..........7..3.7.1...6.53....2.71968...5...........897.137...5.84",
+        "6..95....9.7.6..823...87..6........9.61.49....3....467.45.3......67.42...7.5....4",
+        "1.96.8...82.....6.65...7..9....9.6..462...3..5.8..41...1.9734...7...1.3.......9.7",
+        ".5..1274.........14.29......9.18....6..3471..17429....2........541.....68....15.4",
+        "...9...6..9..86.54653.....8...8.1..6.29.6.1.........457621.34....17..6.2.......1.",
+        ".2.......1...3.2.9894...15..8.......6.9.2.5..35..1...75..2...4.2..74.69.9..1.6.2.",
+        "..2.43.....47.1.8...........361...474.....1..57..24...39.8..456...579..31.5...8..",
+        "..9..3.154.7.5..93..5.......94....37..6.3214.....6...8...186..4....7.9.1.5.3....6",
+        "8.....94....5.4.8.4.7.....27...8.29.3..149..798.7.54.32......3...9..8.....3..71..",
+        ".41...7..8...23....2.4..6.8.3..5..97....8..6.1.....5....4.9632..15.4..7..6..358..",
+        "61..5.79...9.1.........2.3.3....5.2..........2.163954..9.5..2.....87...51.69.387.",
+        "..6.75...42.9...8193.2.17.......6..33.9...648......927..3..2.......5.4..8...3..76",
+        "7.4..1.6..6..3..75359....2......654..46.9.......7..316....73.....7.4.1....581...4",
+        "....2..97..8......39.1....812945.8..5.3...64.7..8...59.....1.65...289...97....3..",
+        "2...3..67..3.8.5.....4..283.61.7.....29....5.3.....419.3...7...576.41....8..5.6..",
+        "..8..56..56..17....37.8.1...5327..6...28...4.78........45.9..761..7.8.9....4.....",
+        ".79...21.1.....8...3.1.5...71..3.4...625...37...671.29.8.2.......1...97...6..4..8",
+        "..1.....55...13.6.4..295...6...5.1.291.....5...7..6..33867......4...932.19....6..",
+        "...43.8..9....2.5...81.9.6.38.6.75.227.5..4.61......7.....8.6........2..49....138",
+        "793.482..682..514.....29.8....5....3........1....6379.8793....2.5....6...6...1...",
+        ".........4...3..168.291.75........9.2..59..78..3.42.611...8......97261....4..12..",
+        "1.....9..86....7..7.....5282.634.1...............9.854...5.9.87..52814.3...76..1.",
+        "...6.43....19837..7342...........5.3.5.8..2..3......86.....84....3.6.81.84..1..37",
+        "...3..8.7.9...5.468439..5...3..6.4.1974....6..6..2.....57194....1.......6.9.3....",
+        "...9.3..7..1..74637386........7.4.1..17.98.45.4.......9.3....7..8.........48619..",
+        "9..34..1..8....6.421.7.6.3....92.45...26..3.9..8.........8..5..856..92.7.2.5.....",
+        "43..752.6.12...359.6.293..........3...3.56.9.98.......24.5.19.....6........8..4.5",
+        "7.8.23..9..........94.7.8..2...8..35...9.7.6.457.....8.4.7..1.658..9.4........593",
+        "..862..4.....4.7.86....7...2.........1.2...56.971..28356..128..1...3....3.4.9..2.",
+        "...1.963.6....39.7.....24.1..1..75..87.4.5...93..2.7.4....742.3..9....4...4.9....",
+        "...3....136.1758.....2..4........98.7.3..91.6......2.7537..4..8.826.....6...5.7.4",
+        "3..6....5.29....7.....4.1..1...683...5.....6...81..25....2..7..2.78356.9.3..7..12",
+        "3.7..6........1.....8....17863159.....1.7.9862...481...5.....61...265..9.....3..5",
+        "85.3..74.476..1....1..8..2...........6.9528.....8.3.67..8..6..56.9...2..5..4...79",
+        "8.......7.....3.581..48.....6...8.344....182..............3.495.15947.8...38.527.",
+        ".25.1.984......6234..9..1.7..97.....58.3.6........1.3.236.....8...5...7....2.439.",
+    ],
+}
+
+# The puzzle/solution pair the ZKP benchmarks prove, the first 'hard' entry above
+HARD_PAIR = (".5....6.4.2984...534..2....5.4.92..8..358..12.....4..39..2.3...4.59......6.....8.",
+             "158739624729846135346125897514392768693587412872614953981273546435968271267451389")
+
+
+def parse_puzzle(text):
+    """Convert an 81-character puzzle string into the 9x9 list-of-lists board format."""
+    values = [int(ch) if ch in '123456789' else 0 for ch in text.strip()]
+    if len(values) != 81:
+        raise ValueError(f"Expected 81 cells, got {len(values)}")
+    return [values[row * 9:row * 9 + 9] for row in range(9)]
+
+
+def format_puzzle(board):
+    """Convert a 9x9 board back into its 81-character string form."""
+    return ''.join(str(value) if value else '.' for row in board for value in row)
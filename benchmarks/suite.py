@@ -0,0 +1,231 @@
+"""
+Regression suite over the generator, solver and ZKP hot paths.
+
+Every benchmark runs on fixed corpora and reports a rate (grids/s, solves/s, commitments/s,
+proofs/s) taken from the best of --repeat runs, plus the peak memory traced during one extra run.
+Save the results as a JSON baseline with --save and check a later run against it with --compare;
+rates that dropped by more than --threshold are flagged and make the script exit with status 1.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from itertools import cycle, islice
+
+from corpus import GENERATED, HARD_PAIR, NAIVE_WORST, PUZZLES, parse_puzzle
+
+from backend.noninteractive import prove, verify
+from backend.puzzle_generator import PuzzleGenerator
+from backend.sudoku_solver import SudokuSolver
+from backend.zkp_protocol import ZeroKnowledgeProof
+
+BENCHMARKS = {}
+
+
+def benchmark(name, unit):
+    """Register a setup function returning (run, operations); run() does `operations` units of work."""
+    def register(setup):
+        BENCHMARKS[name] = (unit, setup)
+        return setup
+    return register
+
+
+def scaled(count, scale):
+    return max(1, round(count * scale))
+
+
+# region Generator
+def _grid_bench(mode, scale):
+    count = scaled(200, scale)
+
+    def run():
+        generator = PuzzleGenerator(mode, seed=42)
+        for _ in range(count):
+            generator.grid = [[0] * 9 for _ in range(9)]
+            generator.generate_full_solution()
+    return run, count
+
+
+benchmark('generate.grids.backtrack', 'grids/s')(lambda scale: _grid_bench('backtrack', scale))
+benchmark('generate.grids.transform', 'grids/s')(lambda scale: _grid_bench('transform', scale))
+
+
+@benchmark('generate.puzzles.hard', 'puzzles/s')
+def _puzzle_bench(scale):
+    count = scaled(20, scale)
+
+    def run():
+        generator = PuzzleGenerator(seed=42)
+        for _ in range(count):
+            generator.generate('hard')
+    return run, count
+# endregion
+
+
+# region Solver
+def _solve_bench(engine, puzzles):
+    def run():
+        for puzzle in puzzles:
+            SudokuSolver([row[:] for row in puzzle], engine).solve()
+    return run, len(puzzles)
+
+
+def _generated(level, scale):
+    return [parse_puzzle(text) for text in islice(cycle(GENERATED[level]), scaled(50, scale))]
+
+
+for _level in ('easy', 'medium', 'hard'):
+    benchmark(f'solve.propagate.{_level}', 'solves/s')(
+        lambda scale, level=_level: _solve_bench('propagate', _generated(level, scale)))
+    benchmark(f'solve.backtrack.{_level}', 'solves/s')(
+        lambda scale, level=_level: _solve_bench('backtrack', _generated(level, scale)))
+
+benchmark('solve.propagate.adversarial', 'solves/s')(
+    lambda scale: _solve_bench('propagate', [parse_puzzle(p) for p in PUZZLES['adversarial']] * scaled(10, scale)))
+benchmark('solve.propagate.naive_worst', 'solves/s')(
+    lambda scale: _solve_bench('propagate', [parse_puzzle(p) for p in NAIVE_WORST] * scaled(10, scale)))
+# The naive backtracker needs minutes here, it only runs with --naive
+benchmark('solve.backtrack.naive_worst', 'solves/s')(
+    lambda scale: _solve_bench('backtrack', [parse_puzzle(p) for p in NAIVE_WORST]))
+SLOW_BENCHMARKS = {'solve.backtrack.naive_worst'}
+# endregion
+
+
+# region ZKP
+def _hard_pair():
+    return tuple(parse_puzzle(text) for text in HARD_PAIR)
+
+
+def _commit_bench(mode, scale):
+    count = scaled(200, scale)
+    zkp = ZeroKnowledgeProof(*_hard_pair(), commitment=mode)
+
+    def run():
+        for _ in range(count):
+            zkp.generate_commitments()
+    return run, count * 81
+
+
+benchmark('commit.legacy', 'commitments/s')(lambda scale: _commit_bench('legacy', scale))
+benchmark('commit.binary', 'commitments/s')(lambda scale: _commit_bench('binary', scale))
+
+
+@benchmark('prove.run_zkp', 'proofs/s')
+def _run_zkp_bench(scale):
+    count = scaled(50, scale)
+    puzzle, solution = _hard_pair()
+
+    def run():
+        for _ in range(count):
+            ZeroKnowledgeProof(puzzle, solution).run_zkp()
+    return run, count
+
+
+@benchmark('prove.noninteractive', 'proofs/s')
+def _prove_bench(scale):
+    count = scaled(3, scale)
+    puzzle, solution = _hard_pair()
+
+    def run():
+        for _ in range(count):
+            prove(puzzle, solution)
+    return run, count
+
+
+@benchmark('verify.noninteractive', 'proofs/s')
+def _verify_bench(scale):
+    count = scaled(10, scale)
+    puzzle, solution = _hard_pair()
+    proof = prove(puzzle, solution)
+
+    def run():
+        for _ in range(count):
+            assert verify(puzzle, proof)
+    return run, count
+# endregion
+
+
+def measure(setup, scale, repeat):
+    """Return (operations per second, best seconds, peak traced KiB) for one benchmark."""
+    run, operations = setup(scale)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    # Tracing slows everything down, so memory gets its own run outside the timed ones
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return operations / best, best, peak / 1024
+
+
+def compare(results, baseline, threshold):
+    """Print the change against a baseline. Returns the names of the benchmarks that regressed."""
+    regressions = []
+    print(f"\n{'benchmark':<32}{'baseline':>14}{'current':>14}{'change':>9}  {'peak KiB':>18}")
+    for name, result in results.items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f"{name:<32}{'-':>14}{result['rate']:>14,.1f}{'new':>9}")
+            continue
+        change = result['rate'] / base['rate'] - 1
+        flag = ""
+        if change < -threshold:
+            regressions.append(name)
+            flag = "  SLOWER"
+        memory = f"{base['peak_kib']:,.0f} -> {result['peak_kib']:,.0f}"
+        print(f"{name:<32}{base['rate']:>14,.1f}{result['rate']:>14,.1f}{change:>+9.1%}  {memory:>18}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per benchmark, the best one counts")
+    parser.add_argument('--scale', type=float, default=1.0, help="multiplies the work done by every benchmark")
+    parser.add_argument('--only', nargs='+', default=None, help="run benchmarks whose name contains any of these")
+    parser.add_argument('--naive', action='store_true', help="include the minutes-long naive worst cases")
+    parser.add_argument('--save', metavar='PATH', help="write the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="compare against a saved JSON baseline")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="flag rates that dropped by more than this fraction (default 0.10)")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if baseline.get('scale') != args.scale:
+            print(f"Warning: the baseline was recorded with --scale {baseline.get('scale')}", file=sys.stderr)
+
+    results = {}
+    print(f"{'benchmark':<32}{'rate':>14} {'unit':<14}{'peak KiB':>10}")
+    for name, (unit, setup) in BENCHMARKS.items():
+        if name in SLOW_BENCHMARKS and not args.naive:
+            continue
+        if args.only and not any(part in name for part in args.only):
+            continue
+        rate, seconds, peak = measure(setup, args.scale, args.repeat)
+        results[name] = {'rate': rate, 'unit': unit, 'seconds': seconds, 'peak_kib': peak}
+        print(f"{name:<32}{rate:>14,.1f} {unit:<14}{peak:>10,.0f}")
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'scale': args.scale, 'results': results}, file, indent=2)
+        print(f"\nBaseline written to {args.save}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmarks slower than the baseline by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
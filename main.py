@@ -0,0 +1,9 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from frontend.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
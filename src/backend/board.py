@@ -0,0 +1,165 @@
+import math
+from functools import lru_cache
+from operator import itemgetter
+
+# Characters for the cell values in string form, boards up to 25x25 (box size 5) can be written out
+DIGIT_CHARS = '.123456789ABCDEFGHIJKLMNOP'
+MAX_BOX_SIZE = 5
+_VALUE_OF = {ch: value for value, ch in enumerate(DIGIT_CHARS)}
+_VALUE_OF['0'] = 0
+
+
+@lru_cache(maxsize=None)
+def unit_tables(box_size):
+    """
+    Flat cell indices of every row, column and box of a board with box_size x box_size boxes
+    (9x9 for box size 3, 16x16 for 4, ...), as (rows, cols, boxes). Boxes are numbered row-major.
+    """
+    side = box_size * box_size
+    rows = [[r * side + c for c in range(side)] for r in range(side)]
+    cols = [[r * side + c for r in range(side)] for c in range(side)]
+    boxes = [[(b // box_size) * box_size * side + (b % box_size) * box_size + r * side + c
+              for r in range(box_size) for c in range(box_size)] for b in range(side)]
+    return rows, cols, boxes
+
+
+def box_size_for(cell_count):
+    """The box size of a board with `cell_count` cells, which must be box_size ** 4."""
+    box_size = math.isqrt(math.isqrt(cell_count))
+    if box_size < 2 or box_size ** 4 != cell_count or box_size > MAX_BOX_SIZE:
+        raise ValueError(f"A board has n^4 cells for a box size n of 2 to {MAX_BOX_SIZE}, got {cell_count}")
+    return box_size
+
+
+# Flat-index lookup tables for the classic 9x9 board, shared by the backend modules
+ROW_OF = [i // 9 for i in range(81)]
+COL_OF = [i % 9 for i in range(81)]
+BOX_OF = [(i // 27) * 3 + (i % 9) // 3 for i in range(81)]
+ROW_CELLS, COL_CELLS, BOX_CELLS = unit_tables(3)
+UNITS = ROW_CELLS + COL_CELLS + BOX_CELLS
+
+
+@lru_cache(maxsize=None)
+def _box_getters(box_size):
+    return [itemgetter(*cells) for cells in unit_tables(box_size)[2]]
+
+
+class Board:
+    """
+    A Sudoku board stored as one byte per cell in row-major order, 0 marks an empty cell.
+
+    Boards are 9x9 (81 cells) unless built from 256 (16x16) or 625 (25x25) cells, see box_size.
+    board[row, col] reads or writes a single cell. board[row] returns a writable memoryview of
+    the row, so code written against the list-of-lists format (board[row][col], iterating rows,
+    iterating values in a row) works on a Board unchanged.
+    """
+    __slots__ = ('cells', 'side')
+
+    def __init__(self, cells=None, box_size=3):
+        # box_size only sizes an empty board, otherwise it follows from the number of cells
+        if cells is None:
+            self.side = box_size * box_size
+            self.cells = bytearray(self.side * self.side)
+        else:
+            self.cells = bytearray(cells)
+            self.side = 9 if len(self.cells) == 81 else box_size_for(len(self.cells)) ** 2
+
+    @property
+    def box_size(self):
+        return math.isqrt(self.side)
+
+    @classmethod
+    def from_lists(cls, grid):
+        return cls(value for row in grid for value in row)
+
+    @classmethod
+    def from_string(cls, text):
+        """
+        Build a board from a string of one character per cell, '.' or '0' marks an empty cell.
+        Values above 9 are written as letters, 'A' for 10 up to 'P' for 25.
+        """
+        return cls(_VALUE_OF.get(ch, 0) for ch in text.strip().upper())
+
+    def to_lists(self):
+        cells, side = self.cells, self.side
+        return [list(cells[row * side:row * side + side]) for row in range(side)]
+
+    def to_string(self):
+        return ''.join(DIGIT_CHARS[value] for value in self.cells)
+
+    def row(self, row):
+        side = self.side
+        return memoryview(self.cells)[row * side:row * side + side]
+
+    def col(self, col):
+        return memoryview(self.cells)[col::self.side]
+
+    def box(self, box):
+        """Values of the box `box`, numbered row-major from the top-left, as a tuple."""
+        return _box_getters(self.box_size)[box](self.cells)
+
+    def view(self):
+        """Zero-copy, writable memoryview over the cells."""
+        return memoryview(self.cells)
+
+    def copy(self):
+        return Board(self.cells)
+
+    def is_complete(self):
+        return 0 not in self.cells
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            row, col = key
+            return self.cells[row * self.side + col]
+        return self.row(key)
+
+    def __setitem__(self, key, value):
+        if isinstance(key, tuple):
+            row, col = key
+            self.cells[row * self.side + col] = value
+        else:
+            self.row(key)[:] = bytes(value)
+
+    def __iter__(self):
+        view, side = memoryview(self.cells), self.side
+        return (view[row * side:row * side + side] for row in range(side))
+
+    def __len__(self):
+        return self.side
+
+    def __eq__(self, other):
+        if isinstance(other, Board):
+            return self.cells == other.cells
+        if isinstance(other, list):
+            return self.to_lists() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Board({self.to_string()!r})"
+
+
+def as_board(board):
+    """Return `board` as a Board, converting from the list-of-lists format if needed."""
+    return board if isinstance(board, Board) else Board.from_lists(board)
+
+
+def copy_board(board):
+    """Copy a Board or a list-of-lists board, keeping its type."""
+    if isinstance(board, Board):
+        return board.copy()
+    return [row[:] for row in board]
+
+
+def box_size_of(board):
+    """The box size of a Board or a list-of-lists board: 3 for 9x9, 4 for 16x16, ..."""
+    if isinstance(board, Board):
+        return board.box_size
+    return box_size_for(len(board) ** 2)
+
+
+def flat_cells(board):
+    """The cell values of a Board or a list-of-lists board as a flat list."""
+    if isinstance(board, Board):
+        return list(board.cells)
+    return [value for row in board for value in row]
@@ -0,0 +1,120 @@
+from backend.board import box_size_for
+
+
+class ExactCover:
+    """
+    Knuth's Algorithm X for Sudoku of any box size, with the dancing-links "cover / uncover"
+    moves done on dicts of sets instead of linked nodes, which is the fast form in Python.
+
+    Every candidate placement (cell, digit) is a row that covers four constraint columns: the
+    cell is filled, and the digit appears in its row, its column and its box. A solution is a set
+    of rows covering every column exactly once. The search always branches on the column with
+    the fewest rows left, and runs iteratively, so 25x25 boards do not hit the recursion limit.
+    """
+
+    def __init__(self, cells):
+        cells = list(cells)
+        self.box_size = box_size_for(len(cells))
+        side = self.box_size * self.box_size
+        self.side = side
+        self.cells = cells
+        self.nodes = 0  # Search nodes visited so far
+
+        area = side * side
+        # Row id cell * side + digit - 1 covers these four column ids
+        self.rows = {}
+        for idx in range(area):
+            r, c = divmod(idx, side)
+            b = (r // self.box_size) * self.box_size + c // self.box_size
+            for d in range(side):
+                self.rows[idx * side + d] = (idx, area + r * side + d, 2 * area + c * side + d,
+                                             3 * area + b * side + d)
+        self.columns = {column: set() for column in range(4 * area)}
+        for row, columns in self.rows.items():
+            for column in columns:
+                self.columns[column].add(row)
+
+        # Place the givens up front. A given whose columns are already covered clashes.
+        self.consistent = True
+        self.givens = []
+        for idx, value in enumerate(cells):
+            if not value:
+                continue
+            row = idx * side + value - 1
+            if value > side or any(column not in self.columns for column in self.rows[row]):
+                self.consistent = False
+                break
+            self._cover(row)
+            self.givens.append(row)
+
+    def _cover(self, row):
+        columns, rows = self.columns, self.rows
+        removed = []
+        for j in rows[row]:
+            for i in columns[j]:
+                for k in rows[i]:
+                    if k != j:
+                        columns[k].discard(i)
+            removed.append(columns.pop(j))
+        return removed
+
+    def _uncover(self, row, removed):
+        columns, rows = self.columns, self.rows
+        for j in reversed(rows[row]):
+            columns[j] = removed.pop()
+            for i in columns[j]:
+                for k in rows[i]:
+                    if k != j:
+                        columns[k].add(i)
+
+    def solutions(self, limit=None):
+        """Yield solved boards as flat cell lists, at most `limit` of them (all by default)."""
+        if not self.consistent:
+            return
+        columns, side = self.columns, self.side
+        chosen = []  # Rows selected on the current path, with the columns each one removed
+        frames = []  # Per depth, an iterator over the rows still to try for its column
+        found = 0
+        while True:
+            if not columns:
+                cells = self.cells[:]
+                for row, _ in chosen:
+                    idx, d = divmod(row, side)
+                    cells[idx] = d + 1
+                yield cells
+                found += 1
+                if limit is not None and found >= limit:
+                    break
+            else:
+                column = min(columns, key=lambda j: len(columns[j]))
+                frames.append(iter(sorted(columns[column])))
+
+            # Move to the next row to try, backing out of exhausted columns
+            while frames:
+                if len(chosen) == len(frames):
+                    row, removed = chosen.pop()
+                    self._uncover(row, removed)
+                row = next(frames[-1], None)
+                if row is None:
+                    frames.pop()
+                    continue
+                self.nodes += 1
+                chosen.append((row, self._cover(row)))
+                break
+            else:
+                return
+
+        # Stopped early: restore the matrix so the search can be run again
+        while chosen:
+            row, removed = chosen.pop()
+            self._uncover(row, removed)
+
+
+def solve(cells):
+    """Solve a board given as a flat cell list of any box size. Returns the solved cells or None."""
+    return next(ExactCover(cells).solutions(limit=1), None)
+
+
+def count_solutions(cells, limit=2):
+    """Count the solutions of a flat cell list, stopping as soon as `limit` have been found."""
+    return sum(1 for _ in ExactCover(cells).solutions(limit))
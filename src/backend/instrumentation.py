@@ -0,0 +1,132 @@
+import cProfile
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# The Stats being recorded into, None while instrumentation is off. Instrumented code reads this
+# once per operation (a solve, a commitment set, an opening), so the disabled cost is one global
+# lookup and a None check; nothing is counted inside the per-cell hot loops.
+active = None
+
+PHASES = ('generate', 'solve', 'commit', 'open', 'verify')
+
+
+class Stats:
+    """
+    Counters and per-phase wall time collected while instrumentation is enabled.
+
+    Counters:
+    - nodes: Search nodes visited by SudokuSolver.solve.
+    - candidate_checks: valid() calls of the backtracking engine (the other engines do not
+      report it).
+    - generator_nodes: Digits placed while building full grids, retries included.
+    - carve_nodes: Search nodes spent checking uniqueness while carving puzzles.
+    - hash_calls: SHA-256 computations for commitments and Merkle trees.
+
+    Only work done in this process is recorded, process pool workers are not seen.
+    """
+
+    def __init__(self):
+        self.counters = Counter()
+        self.calls = Counter()  # Calls per phase
+        self.seconds = Counter()  # Wall time per phase
+        self.profile = None  # The cProfile.Profile of an instrument(profile=True) block
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def add_time(self, phase, seconds):
+        self.calls[phase] += 1
+        self.seconds[phase] += seconds
+
+    @contextmanager
+    def phase(self, name):
+        """Charge the wall time of the block to phase `name`."""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def reset(self):
+        self.counters.clear()
+        self.calls.clear()
+        self.seconds.clear()
+        self.profile = None
+
+    def as_dict(self):
+        return {
+            'counters': dict(self.counters),
+            'phases': {phase: {'calls': self.calls[phase], 'seconds': self.seconds[phase]} for phase in self.seconds},
+        }
+
+    def to_json(self, path=None):
+        """Return the stats as a JSON string, and write it to `path` if given."""
+        text = json.dumps(self.as_dict(), indent=2)
+        if path is not None:
+            with open(path, 'w') as file:
+                file.write(text + '\n')
+        return text
+
+    def dump_profile(self, path):
+        """Write the recorded profile in cProfile's format, readable by pstats, snakeviz and friends."""
+        if self.profile is None:
+            raise ValueError("No profile was recorded, use instrument(profile=True)")
+        self.profile.dump_stats(path)
+
+    def report(self):
+        lines = [f"{'phase':<10}{'calls':>9}{'seconds':>12}"]
+        for phase, seconds in sorted(self.seconds.items(), key=lambda item: -item[1]):
+            lines.append(f"{phase:<10}{self.calls[phase]:>9}{seconds:>12.4f}")
+        lines.extend(f"{name:<19}{value:>12,}" for name, value in sorted(self.counters.items()))
+        return '\n'.join(lines)
+
+
+@contextmanager
+def instrument(stats=None, profile=False):
+    """
+    Enable instrumentation for the duration of the block and yield the Stats being recorded.
+
+    Args:
+    - stats: A Stats to keep adding to, a fresh one by default.
+    - profile: Also run cProfile over the block; the profile ends up in stats.profile.
+    """
+    global active
+    stats = stats if stats is not None else Stats()
+    previous, active = active, stats
+    profiler = cProfile.Profile() if profile else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield stats
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            stats.profile = profiler
+        active = previous
+
+
+@contextmanager
+def phase(name):
+    """Time a block as phase `name` when instrumentation is enabled, do nothing otherwise."""
+    stats = active
+    if stats is None:
+        yield None
+        return
+    with stats.phase(name):
+        yield stats
+
+
+def count(name, amount=1):
+    """Add to counter `name` when instrumentation is enabled."""
+    stats = active
+    if stats is not None:
+        stats.count(name, amount)
+
+
+def add_time(phase, start):
+    """Charge the time since `start`, a time.perf_counter() reading, to `phase` when enabled."""
+    stats = active
+    if stats is not None:
+        stats.add_time(phase, time.perf_counter() - start)
@@ -0,0 +1,89 @@
+import hashlib
+
+from backend import instrumentation
+
+DIGEST_SIZE = 32
+EMPTY_LEAF = bytes(DIGEST_SIZE)  # Pads the leaf level up to a power of two
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'  # Different prefixes keep a leaf from being passed off as an inner node
+
+
+def hash_leaf(digest):
+    return hashlib.sha256(LEAF_PREFIX + digest).digest()
+
+
+def hash_node(left, right):
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+class MerkleTree:
+    """
+    Binary SHA-256 Merkle tree over a list of 32-byte commitment digests.
+
+    Only the 32-byte root needs to be published. Opening a set of leaves then takes a single
+    multi-proof: the sibling nodes needed to rebuild the root from those leaves, with every node
+    that several paths share, or that the verifier can compute itself, sent only once or not at all.
+    """
+
+    def __init__(self, leaves):
+        leaves = [bytes(leaf) for leaf in leaves]
+        if not leaves:
+            raise ValueError("A Merkle tree needs at least one leaf")
+        self.leaf_count = len(leaves)
+        width = 1 << (self.leaf_count - 1).bit_length()
+        level = [hash_leaf(leaf) for leaf in leaves] + [EMPTY_LEAF] * (width - self.leaf_count)
+        self.levels = [level]
+        while len(level) > 1:
+            level = [hash_node(level[i], level[i + 1]) for i in range(0, len(level), 2)]
+            self.levels.append(level)
+        instrumentation.count('hash_calls', self.leaf_count + width - 1)
+
+    @property
+    def root(self):
+        return self.levels[-1][0]
+
+    def prove(self, indices):
+        """Return the list of sibling nodes needed to authenticate the leaves at `indices`."""
+        known = sorted(set(indices))
+        nodes = []
+        for level in self.levels[:-1]:
+            known_set = set(known)
+            for i in known:
+                if i ^ 1 not in known_set:
+                    nodes.append(level[i ^ 1])
+            known = sorted({i >> 1 for i in known})
+        return nodes
+
+
+def verify_proof(root, leaf_count, leaves, nodes):
+    """
+    Check a multi-proof produced by MerkleTree.prove.
+
+    Args:
+    - root: The published 32-byte root.
+    - leaf_count: Number of leaves the tree was built over.
+    - leaves: A dict mapping leaf index to the leaf digest the verifier recomputed.
+    - nodes: The proof nodes, in the order MerkleTree.prove returned them.
+    """
+    if not leaves or any(not 0 <= i < leaf_count for i in leaves):
+        return False
+    width = 1 << (leaf_count - 1).bit_length()
+    known = {i: hash_leaf(bytes(leaf)) for i, leaf in leaves.items()}
+    hashed = len(known)
+    nodes = iter(nodes)
+    while width > 1:
+        parents = {}
+        for i in sorted(known):
+            if i & 1 and i ^ 1 in known:
+                continue  # Already combined with its left sibling
+            sibling = known.get(i ^ 1)
+            if sibling is None:
+                sibling = next(nodes, None)
+                if sibling is None:
+                    return False
+            parents[i >> 1] = hash_node(known[i], sibling) if not i & 1 else hash_node(sibling, known[i])
+        known = parents
+        hashed += len(parents)
+        width >>= 1
+    instrumentation.count('hash_calls', hashed)
+    return next(nodes, None) is None and known.get(0) == root
@@ -0,0 +1,87 @@
+import os
+import threading
+from collections import deque
+
+NONCE_SIZE = 32
+NONCES_PER_PROOF = 81
+PROOF_NONCES_SIZE = NONCE_SIZE * NONCES_PER_PROOF
+
+
+class NoncePool:
+    """
+    Pre-filled pool of cryptographically secure nonces, one 81 x 32-byte block per proof.
+
+    Blocks are cut as memoryview slices out of a single large os.urandom() read, so a refill costs
+    one syscall per `batch` proofs and handing a block out copies nothing. Every refill reads fresh
+    bytes into a new buffer, so blocks already handed out are never overwritten. A background
+    thread tops the pool up once it falls below `low_water` blocks; if it ever runs dry, take()
+    reads a block directly.
+    """
+
+    def __init__(self, batch=256, low_water=64, background=True):
+        self.batch = batch
+        self.low_water = low_water
+        self.background = background
+        self._blocks = deque()
+        self._refill_needed = threading.Event()
+        self._worker = None
+        self._pid = os.getpid()
+        self.refill()
+
+    def refill(self):
+        view = memoryview(os.urandom(self.batch * PROOF_NONCES_SIZE))
+        self._blocks.extend(view[offset:offset + PROOF_NONCES_SIZE]
+                            for offset in range(0, len(view), PROOF_NONCES_SIZE))
+
+    def take(self):
+        """Return a read-only memoryview of 81 * 32 fresh random bytes."""
+        if os.getpid() != self._pid:
+            self._reset_after_fork()
+        try:
+            block = self._blocks.popleft()  # deque.popleft is atomic, no lock needed
+        except IndexError:
+            block = memoryview(os.urandom(PROOF_NONCES_SIZE))
+        if len(self._blocks) < self.low_water:
+            self._wake_worker()
+        return block
+
+    def _wake_worker(self):
+        if not self.background:
+            self.refill()
+            return
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._refill_loop, name='nonce-pool-refill', daemon=True)
+            self._worker.start()
+        self._refill_needed.set()
+
+    def _refill_loop(self):
+        while True:
+            self._refill_needed.wait()
+            self._refill_needed.clear()
+            while len(self._blocks) < self.low_water + self.batch:
+                self.refill()
+
+    def _reset_after_fork(self):
+        # A forked child inherits the parent's unused blocks, which the parent and every other child
+        # would hand out as well. Drop them and start over with fresh bytes and a new worker.
+        self._pid = os.getpid()
+        self._blocks = deque()
+        self._refill_needed = threading.Event()
+        self._worker = None
+        self.refill()
+
+
+_default_pool = None
+
+
+def default_pool():
+    """The process-wide NoncePool, created on first use."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = NoncePool()
+    return _default_pool
+
+
+def proof_nonces():
+    """81 * 32 fresh random bytes for one proof, from the process-wide pool."""
+    return default_pool().take()
@@ -0,0 +1,180 @@
+import hashlib
+import struct
+import time
+
+from backend import instrumentation
+from backend.board import as_board
+from backend.merkle import verify_proof
+from backend.proof_runner import CHALLENGES, check_board_size, permuted_proof, rounds_for_soundness
+from backend.zkp_protocol import DIGEST_SIZE, NONCE_SIZE, SELECTION_CELLS, hash_cell
+
+# Proof layout, all integers big-endian:
+#   header:     MAGIC | version (1 byte) | rounds (4 bytes)
+#   per round:  version 1: 81 commitment digests (81 * 32 bytes)
+#               version 2: Merkle root (32 bytes) | proof node count (1 byte) | proof nodes (32 bytes each)
+#               opened cell count (1 byte) | per opened cell: value (1 byte) | nonce (32 bytes)
+# The opened cells are not listed, the verifier derives them from the challenge.
+MAGIC = b'ZKNI'
+FLAT_VERSION = 1
+MERKLE_VERSION = 2
+_HEADER = struct.Struct('>4sBI')
+CHALLENGE_DOMAIN = b'zkp-sudoku/fiat-shamir/v1'
+ROUND_COMMITMENTS_SIZE = 81 * DIGEST_SIZE
+OPENED_CELL_SIZE = 1 + NONCE_SIZE
+
+
+def commitment_root(commitments):
+    """Single digest binding one round's 81 commitment digests."""
+    return hashlib.sha256(commitments).digest()
+
+
+def derive_challenges(puzzle, roots):
+    """
+    Fiat-Shamir: derive every round's challenge from the puzzle and the commitment roots of all
+    rounds, so the prover can no longer pick commitments after seeing a challenge.
+    """
+    seed = hashlib.sha256(CHALLENGE_DOMAIN + bytes(puzzle.cells) + b''.join(roots)).digest()
+    challenges = []
+    for number in range(len(roots)):
+        draw = hashlib.sha256(seed + number.to_bytes(4, 'big')).digest()
+        challenges.append(CHALLENGES[int.from_bytes(draw, 'big') % len(CHALLENGES)])
+    return challenges
+
+
+def challenge_cells(puzzle, challenge):
+    """Flat indices of the cells a challenge opens, in the order the proof lists them."""
+    selection_type, index = challenge
+    if selection_type == 'givens':
+        return [idx for idx, value in enumerate(puzzle.cells) if value]
+    return SELECTION_CELLS[selection_type][index]
+
+
+def check_challenge_values(puzzle, challenge, values):
+    """
+    Check the card values opened for a challenge, listed in challenge_cells order: a unit must
+    hold 1..9 exactly once, the givens must be a consistent one-to-one relabeling of the puzzle.
+    """
+    if challenge[0] != 'givens':
+        return sorted(values) == list(range(1, 10))
+    relabel = {}
+    for idx, value in zip(challenge_cells(puzzle, challenge), values):
+        if not 1 <= value <= 9 or relabel.setdefault(puzzle.cells[idx], value) != value:
+            return False
+    return len(set(relabel.values())) == len(relabel)
+
+
+def prove(puzzle, solution, soundness=2 ** -40, merkle=True):
+    """
+    Build a self-contained non-interactive proof that the prover knows a solution of `puzzle`.
+
+    Every round commits to a freshly relabeled solution with fresh nonces. Only the cells named
+    by each round's challenge are opened. With merkle=True a round carries its Merkle root and the
+    authentication nodes of the opened cells instead of all 81 commitment digests.
+    """
+    puzzle, solution = as_board(puzzle), as_board(solution)
+    check_board_size(puzzle, solution)
+    rounds = rounds_for_soundness(soundness)
+    proofs = [permuted_proof(puzzle, solution, 'binary', merkle) for _ in range(rounds)]
+
+    if merkle:
+        roots = [zkp.merkle_root for zkp in proofs]
+    else:
+        roots = [commitment_root(zkp.commitments) for zkp in proofs]
+    parts = [_HEADER.pack(MAGIC, MERKLE_VERSION if merkle else FLAT_VERSION, rounds)]
+    for zkp, root, challenge in zip(proofs, roots, derive_challenges(puzzle, roots)):
+        cells = challenge_cells(puzzle, challenge)
+        if merkle:
+            nodes = zkp.merkle_tree.prove(cells)
+            parts.append(root)
+            parts.append(bytes((len(nodes),)))
+            parts.extend(nodes)
+        else:
+            parts.append(zkp.commitments)
+        parts.append(bytes((len(cells),)))
+        for idx in cells:
+            parts.append(bytes((zkp.cards.cells[idx],)))
+            parts.append(zkp.nonces[idx])
+    return b''.join(parts)
+
+
+def verify(puzzle, proof, soundness=2 ** -40):
+    """
+    Check a proof produced by prove() against the puzzle alone.
+
+    Proofs with too few rounds to push the soundness error below `soundness` are rejected: the
+    prover picks the round count, so the verifier sets the bar, never the proof header.
+    Returns True or False, malformed proofs are rejected rather than raising. Puzzles that are not
+    9x9 raise ValueError.
+    """
+    start = time.perf_counter()
+    puzzle = as_board(puzzle)
+    check_board_size(puzzle)
+    verdict = _verify(puzzle, proof, soundness)
+    instrumentation.add_time('verify', start)
+    return verdict
+
+
+def _verify(puzzle, proof, soundness):
+    if len(proof) < _HEADER.size:
+        return False
+    magic, version, rounds = _HEADER.unpack_from(proof)
+    if magic != MAGIC or version not in (FLAT_VERSION, MERKLE_VERSION) or rounds == 0:
+        return False
+    if rounds < rounds_for_soundness(soundness):
+        return False
+
+    # Split the rounds first, the challenges depend on every round's commitments.
+    # `authentication` is the 81 commitment digests (version 1) or the Merkle proof nodes (version 2).
+    view = memoryview(proof)
+    offset = _HEADER.size
+    round_parts = []
+    roots = []
+    for _ in range(rounds):
+        if version == MERKLE_VERSION:
+            if offset + DIGEST_SIZE >= len(proof):
+                return False
+            root = bytes(view[offset:offset + DIGEST_SIZE])
+            node_count = proof[offset + DIGEST_SIZE]
+            offset += DIGEST_SIZE + 1
+            authentication = [bytes(view[start:start + DIGEST_SIZE])
+                              for start in range(offset, offset + node_count * DIGEST_SIZE, DIGEST_SIZE)]
+            offset += node_count * DIGEST_SIZE
+        else:
+            authentication = view[offset:offset + ROUND_COMMITMENTS_SIZE]
+            offset += ROUND_COMMITMENTS_SIZE
+            root = None
+        if offset >= len(proof):
+            return False
+        count = proof[offset]
+        openings = view[offset + 1:offset + 1 + count * OPENED_CELL_SIZE]
+        offset += 1 + count * OPENED_CELL_SIZE
+        if offset > len(proof):
+            return False
+        roots.append(root or commitment_root(authentication))
+        round_parts.append((authentication, count, openings))
+    if offset != len(proof):
+        return False
+
+    for (authentication, count, openings), root, challenge in zip(round_parts, roots,
+                                                                 derive_challenges(puzzle, roots)):
+        cells = challenge_cells(puzzle, challenge)
+        if count != len(cells):
+            return False
+        values = bytes(openings[position * OPENED_CELL_SIZE] for position in range(count))
+        if not check_challenge_values(puzzle, challenge, values):
+            return False
+
+        leaves = {}
+        for position, idx in enumerate(cells):
+            start = position * OPENED_CELL_SIZE
+            leaves[idx] = hash_cell(idx, values[position], openings[start + 1:start + OPENED_CELL_SIZE])
+        instrumentation.count('hash_calls', len(leaves))
+
+        if version == MERKLE_VERSION:
+            if cells and not verify_proof(root, 81, leaves, authentication):
+                return False
+        else:
+            for idx, digest in leaves.items():
+                if authentication[idx * DIGEST_SIZE:(idx + 1) * DIGEST_SIZE] != digest:
+                    return False
+    return True
@@ -0,0 +1,35 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+
+def chunked(items, size):
+    """Group any iterable into lists of `size` items (the last one may be shorter), lazily."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bounded_map(func, jobs, workers=None, depth=2):
+    """
+    Map func over jobs in a process pool and yield the results in input order.
+
+    At most depth * workers jobs are in flight, so the input is read, processed and consumed
+    concurrently without ever being held in memory as a whole. workers=1 runs in this process.
+    """
+    if workers == 1:
+        yield from map(func, jobs)
+        return
+    limit = depth * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        window = deque()
+        for job in jobs:
+            window.append(pool.submit(func, job))
+            if len(window) >= limit:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
@@ -0,0 +1,152 @@
+import math
+import random
+import secrets
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import lru_cache
+
+from backend.board import Board, as_board
+from backend.zkp_protocol import ZeroKnowledgeProof
+
+
+@lru_cache(maxsize=None)
+def challenges(side=9):
+    """
+    Every round the verifier asks for one of the 3 * side units or for the givens, so a prover
+    without a valid solution is caught with probability at least 1 / (3 * side + 1) per round.
+    """
+    return tuple([(selection_type, index) for selection_type in ('row', 'column', 'grid') for index in range(side)]
+                 + [('givens', None)])
+
+
+# The 28 challenges of the 9x9 board, the only size the non-interactive and service formats carry
+CHALLENGES = list(challenges(9))
+
+RoundResult = namedtuple('RoundResult', ['round', 'selection_type', 'index', 'verified'])
+ProofReport = namedtuple('ProofReport', ['accepted', 'rounds', 'rounds_run', 'soundness_error', 'seconds',
+                                         'rounds_per_second', 'failed_round'])
+
+
+def rounds_for_soundness(target, side=9):
+    """Number of independent rounds needed to push the soundness error below `target`."""
+    if not 0 < target < 1:
+        raise ValueError("The target soundness error must be between 0 and 1")
+    per_round = 1 - 1 / len(challenges(side))
+    return math.ceil(math.log(target) / math.log(per_round))
+
+
+def soundness_error(rounds, side=9):
+    return (1 - 1 / len(challenges(side))) ** rounds
+
+
+def check_board_size(*boards):
+    """
+    Raise ValueError unless every board is 9x9. The wire formats of the non-interactive proofs and
+    the prover service are fixed to 81 cells.
+    """
+    for board in boards:
+        if len(board) != 9:
+            raise ValueError(f"Multi-round proofs only support 9x9 boards, got {len(board)}x{len(board)}")
+
+
+def permuted_proof(puzzle, solution, commitment='binary', merkle=False):
+    """
+    A ZeroKnowledgeProof over copies of the puzzle and solution Boards whose digits are relabeled
+    by a fresh random permutation, so commitments from different rounds cannot be linked.
+    """
+    digits = list(range(1, len(puzzle) + 1))
+    random.SystemRandom().shuffle(digits)
+    relabel = bytes([0] + digits) + bytes(255 - len(digits))  # translate() wants a 256-byte table
+    return ZeroKnowledgeProof(Board(puzzle.cells.translate(relabel)), Board(solution.cells.translate(relabel)),
+                              commitment, merkle)
+
+
+def run_round(number, puzzle, solution, commitment='binary'):
+    """
+    Run one independent round: relabel the digits with a fresh random permutation, commit with
+    fresh nonces, answer one uniformly chosen challenge and verify the opening.
+    """
+    zkp = permuted_proof(puzzle, solution, commitment)
+
+    selection_type, index = secrets.choice(challenges(len(puzzle)))
+    if selection_type == 'givens':
+        # The verifier only knows the original puzzle, the prover's cards carry permuted digits
+        verified = zkp.verify_givens(puzzle)
+    else:
+        verified = zkp.verify_complete_selection(selection_type, index)
+    return RoundResult(number, selection_type, index, verified)
+
+
+def _run_round_chunk(start, count, puzzle_cells, solution_cells, commitment):
+    """Run `count` rounds in a worker. Kept at module level so it can be pickled."""
+    puzzle, solution = Board(puzzle_cells), Board(solution_cells)
+    return [run_round(number, puzzle, solution, commitment) for number in range(start, start + count)]
+
+
+class ProofRunner:
+    """
+    Repeats the proof in independent rounds until the requested soundness error is reached. Works
+    for any box size; larger boards have more challenges, so they need more rounds.
+
+    Rounds are dispatched in chunks to a thread or process pool and their results are checked as
+    they arrive, so a failing round rejects the proof without waiting for the rest.
+    """
+    EXECUTORS = ('thread', 'process')
+
+    def __init__(self, puzzle, solution, soundness=2 ** -40, workers=None, executor='process',
+                 commitment='binary', chunk_size=32):
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unknown executor {executor!r}, expected one of {self.EXECUTORS}")
+        self.puzzle = as_board(puzzle)
+        self.solution = as_board(solution)
+        if len(self.puzzle) != len(self.solution):
+            raise ValueError("The puzzle and the solution must have the same size")
+        self.soundness = soundness
+        self.rounds = rounds_for_soundness(soundness, len(self.puzzle))
+        self.workers = workers
+        self.executor = executor
+        self.commitment = commitment
+        self.chunk_size = chunk_size
+
+    def _make_pool(self):
+        if self.executor == 'thread':
+            return ThreadPoolExecutor(max_workers=self.workers)
+        return ProcessPoolExecutor(max_workers=self.workers)
+
+    def stream(self):
+        """Yield a RoundResult for every round as soon as its chunk completes."""
+        puzzle_cells, solution_cells = bytes(self.puzzle.cells), bytes(self.solution.cells)
+        with self._make_pool() as pool:
+            pending = {pool.submit(_run_round_chunk, start, min(self.chunk_size, self.rounds - start),
+                                   puzzle_cells, solution_cells, self.commitment)
+                       for start in range(0, self.rounds, self.chunk_size)}
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def run(self):
+        """Run every round and return a ProofReport. Stops at the first failing round."""
+        start = time.perf_counter()
+        rounds_run = 0
+        failed_round = None
+        for result in self.stream():
+            rounds_run += 1
+            if not result.verified:
+                failed_round = result
+                break
+        seconds = time.perf_counter() - start
+        return ProofReport(
+            accepted=failed_round is None,
+            rounds=self.rounds,
+            rounds_run=rounds_run,
+            soundness_error=soundness_error(self.rounds, len(self.puzzle)),
+            seconds=seconds,
+            rounds_per_second=rounds_run / seconds if seconds else float('inf'),
+            failed_round=failed_round,
+        )
@@ -0,0 +1,198 @@
+import mmap
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, only one process may open a bank there
+    fcntl = None
+
+from backend.puzzle_generator import LEVEL_CLUES, PuzzleGenerator
+
+MAGIC = b'ZKSB'
+VERSION = 1
+HEADER_SIZE = 8
+GRID_SIZE = 41  # 81 cells packed as 4-bit nibbles, the last low nibble is padding
+RECORD_SIZE = 1 + 2 * GRID_SIZE  # status byte, puzzle, solution
+USED_FLAG = 0x80  # Set in the status byte once a record has been handed out
+LEVELS = tuple(LEVEL_CLUES)
+
+
+def pack_grid(grid):
+    """Pack a 9x9 grid into 41 bytes, two cells per byte."""
+    cells = [value for row in grid for value in row] + [0]
+    return bytes((cells[i] << 4) | cells[i + 1] for i in range(0, 82, 2))
+
+
+def unpack_grid(data):
+    """Unpack 41 bytes produced by pack_grid back into a 9x9 grid."""
+    cells = []
+    for byte in data:
+        cells.append(byte >> 4)
+        cells.append(byte & 0x0F)
+    return [cells[row * 9:row * 9 + 9] for row in range(9)]
+
+
+class PuzzleBank:
+    """
+    Pre-generated puzzle/solution pairs stored in a memory-mapped file and indexed by difficulty.
+
+    Records are appended to the file and never rewritten, except for the used flag in their
+    status byte. Handing out a puzzle pops the next record offset from the level's queue and sets
+    that flag under a lock, so a record is never served twice, not even after a restart. Appends
+    and hand-outs also hold an flock on the file, so several processes can share one bank; on
+    platforms without fcntl only one process may open it.
+    """
+
+    def __init__(self, path, low_water=16, batch_size=64, seed=None):
+        self.path = path
+        self.low_water = low_water
+        self.batch_size = batch_size
+        self.generator = PuzzleGenerator('backtrack', seed=seed)  # Fresh grids, not shuffles of one seed grid
+        self._lock = threading.Lock()  # Guards the file, the mmap and the queues
+        self._generator_lock = threading.Lock()
+        self._queues = {level: deque() for level in LEVELS}
+        self._refill_needed = threading.Event()
+        self._stop = threading.Event()
+        self._worker = None
+
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, 'wb') as new_file:
+                new_file.write(MAGIC + bytes([VERSION]) + bytes(HEADER_SIZE - len(MAGIC) - 1))
+
+        self._file = open(path, 'r+b')
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        if self._mmap[:len(MAGIC)] != MAGIC or self._mmap[len(MAGIC)] != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} puzzle bank")
+        try:
+            self._index(HEADER_SIZE)
+        except ValueError:
+            self.close()
+            raise
+
+    def _index(self, start):
+        # Queue every unused record from `start` onwards under its difficulty level
+        for offset in range(start, len(self._mmap) - RECORD_SIZE + 1, RECORD_SIZE):
+            status = self._mmap[offset]
+            if status & ~USED_FLAG >= len(LEVELS):
+                raise ValueError(f"{self.path} has a corrupt status byte {status:#04x} at offset {offset}")
+            if not status & USED_FLAG:
+                self._queues[LEVELS[status]].append(offset)
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold an exclusive flock on the bank file, shutting out other processes."""
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def available(self, level):
+        return len(self._queues[self._check_level(level)])
+
+    def add_many(self, level, pairs):
+        """Append (puzzle, solution) pairs to the bank under the given difficulty level."""
+        status = bytes([LEVELS.index(self._check_level(level))])
+        data = b''.join(status + pack_grid(puzzle) + pack_grid(solution) for puzzle, solution in pairs)
+        with self._lock, self._file_lock():
+            # Also indexes whatever other processes appended since the last remap
+            start = len(self._mmap)
+            self._file.seek(0, os.SEEK_END)
+            self._file.write(data)
+            self._file.flush()
+            self._mmap.close()
+            self._mmap = mmap.mmap(self._file.fileno(), 0)
+            self._index(start)
+
+    def add(self, level, puzzle, solution):
+        self.add_many(level, [(puzzle, solution)])
+
+    def take(self, level):
+        """
+        Hand out an unused (puzzle, solution) pair for the given level.
+
+        When the level has run dry a pair is generated on the spot. Either way the background
+        worker, if running, is woken up once the level falls below the low-water mark.
+        """
+        level = self._check_level(level)
+        with self._lock, self._file_lock():
+            queue = self._queues[level]
+            offset = None
+            while queue and offset is None:
+                offset = queue.popleft()
+                if self._mmap[offset] & USED_FLAG:
+                    offset = None  # Handed out by another process sharing the bank
+            if offset is not None:
+                self._mmap[offset] |= USED_FLAG
+                record = self._mmap[offset + 1:offset + RECORD_SIZE]
+            if len(queue) < self.low_water:
+                self._refill_needed.set()
+
+        if offset is None:
+            with self._generator_lock:
+                puzzle = self.generator.generate(level)
+                return puzzle, self.generator.solution
+        return unpack_grid(record[:GRID_SIZE]), unpack_grid(record[GRID_SIZE:])
+
+    def refill(self, level):
+        """Generate puzzles in batches until the level holds at least low_water + batch_size of them."""
+        level = self._check_level(level)
+        while not self._stop.is_set() and self.available(level) < self.low_water + self.batch_size:
+            pairs = []
+            with self._generator_lock:
+                for _ in range(self.batch_size):
+                    puzzle = self.generator.generate(level)
+                    pairs.append((puzzle, self.generator.solution))
+            self.add_many(level, pairs)
+
+    def start(self):
+        """Start the background refill worker."""
+        if self._worker is None:
+            self._stop.clear()
+            self._refill_needed.set()
+            self._worker = threading.Thread(target=self._refill_loop, name='puzzle-bank-refill', daemon=True)
+            self._worker.start()
+
+    def stop(self):
+        self._stop.set()
+        self._refill_needed.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    def _refill_loop(self):
+        while not self._stop.is_set():
+            self._refill_needed.wait()
+            self._refill_needed.clear()
+            for level in LEVELS:
+                if self.available(level) < self.low_water:
+                    self.refill(level)
+
+    def close(self):
+        self.stop()
+        if not self._mmap.closed:
+            self._mmap.flush()
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def _check_level(level):
+        if level not in LEVEL_CLUES:
+            raise ValueError(f"Unknown difficulty level {level!r}, expected one of {LEVELS}")
+        return level
@@ -1,9 +1,50 @@
 import random
+import time
+
+from backend import dlx, instrumentation
+from backend.board import flat_cells
+from backend.sudoku_solver import SolutionCounter
+
+# Target number of clues left on the board for each difficulty level
+LEVEL_CLUES = {'easy': 61, 'medium': 46, 'hard': 31}
+
+
+def pattern_grid(box_size=3):
+    """A valid full grid for the given box size, the default starting point for symmetry transforms."""
+    side = box_size * box_size
+    return [[(box_size * (row % box_size) + row // box_size + col) % side + 1 for col in range(side)]
+            for row in range(side)]
+
+
+PATTERN_GRID = pattern_grid(3)
 
 
 class PuzzleGenerator:
-    def __init__(self):
-        self._grid = [[0 for _ in range(9)] for _ in range(9)]
+    MODES = ('backtrack', 'transform')
+
+    def __init__(self, mode=None, seed=None, seed_grids=None, box_size=3):
+        """
+        Args:
+        - mode: 'backtrack' or 'transform'. Boards other than 9x9 (box_size != 3) are always built
+          by transforms; the default is 'backtrack' for 9x9 and 'transform' otherwise.
+        - seed: Seed for the generator's own random.Random, so runs can be reproduced.
+        - seed_grids: Full grids the transform mode starts from.
+        - box_size: 3 for 9x9 boards, 4 for 16x16, 5 for 25x25.
+        """
+        if mode is None:
+            mode = 'backtrack' if box_size == 3 else 'transform'
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown generation mode {mode!r}, expected one of {self.MODES}")
+        if mode == 'backtrack' and box_size != 3:
+            raise ValueError("The backtrack mode only builds 9x9 grids, use mode='transform'")
+        self.box_size = box_size
+        self.side = box_size * box_size
+        self._grid = [[0 for _ in range(self.side)] for _ in range(self.side)]
+        self.solution = None  # The full grid behind the last generated puzzle
+        self.mode = mode
+        self.rng = random.Random(seed)  # Seeded so runs can be reproduced
+        self.seed_grids = seed_grids or [pattern_grid(box_size)]
+        self.carve_nodes = 0  # Uniqueness-check search nodes spent by the last generate()
 
     @property
     def grid(self):
@@ -13,27 +54,67 @@ class PuzzleGenerator:
     def grid(self, value):
         self._grid = value
 
-    def generate_full_solution(self):
+    def generate_full_solution(self, stats=None):
+        """Fill self.grid with a full valid grid. With `stats`, digits placed are counted into it."""
+        if self.mode == 'transform':
+            self.grid = self.transform_grid(self.rng.choice(self.seed_grids))
+            return True
+        return self._generate_backtrack(stats)
+
+    def _generate_backtrack(self, stats=None):
         number_list = [1, 2, 3, 4, 5, 6, 7, 8, 9]
         for i in range(0, 81):
             row = i // 9
             col = i % 9
             if self.grid[row][col] == 0:
-                random.shuffle(number_list)
+                self.rng.shuffle(number_list)
                 for number in number_list:
                     if not (number in self.grid[row]) and \
                             all(number != self.grid[x][col] for x in range(9)):
                         square = self.get_square(row, col)
                         if number not in (square[0] + square[1] + square[2]):
                             self.grid[row][col] = number
+                            if stats is not None:
+                                stats.count('generator_nodes')
                             if self.check_grid():
                                 return True
                             else:
-                                if self.generate_full_solution():
+                                if self._generate_backtrack(stats):
                                     return True
                 break
         self.grid[row][col] = 0
 
+    def transform_grid(self, grid):
+        """
+        Returns a new valid grid built from a valid grid by a random validity-preserving transform:
+        digit relabeling, row/column swaps within bands and stacks, band and stack swaps, and
+        transposition. The source grid may be a Board or a list-of-lists grid.
+        """
+        cells = flat_cells(grid)
+        rng = self.rng
+        side = self.side
+        digits = list(range(1, side + 1))
+        rng.shuffle(digits)
+        relabel = [0] + digits
+
+        rows = self._random_line_order()
+        cols = self._random_line_order()
+        if rng.random() < 0.5:
+            return [[relabel[cells[r * side + c]] for r in rows] for c in cols]
+        return [[relabel[cells[r * side + c]] for c in cols] for r in rows]
+
+    def _random_line_order(self):
+        # Shuffle the bands (or stacks), then the lines inside each of them
+        box_size = self.box_size
+        bands = list(range(0, self.side, box_size))
+        self.rng.shuffle(bands)
+        order = []
+        for band in bands:
+            lines = list(range(band, band + box_size))
+            self.rng.shuffle(lines)
+            order.extend(lines)
+        return order
+
     def get_square(self, row, col):
         square = []
         if row < 3:
@@ -65,14 +146,98 @@ class PuzzleGenerator:
                 return False
         return True
 
-    def generate(self, level='medium'):
-        self.generate_full_solution()
-        # Simplification for demo: Remove a set number of cells based on difficulty
-        empties = {'easy': 20, 'medium': 35, 'hard': 50}.get(level, 35)
-        while empties > 0:
-            row = random.randint(0, 8)
-            col = random.randint(0, 8)
-            if self.grid[row][col] != 0:
-                self.grid[row][col] = 0
-                empties -= 1
+    def generate(self, level='medium', clues=None, min_effort=None, unique=True):
+        """
+        Generate a puzzle and return it; the full grid it came from is kept in self.solution.
+
+        Args:
+        - level: 'easy', 'medium' or 'hard', mapped to a clue count by LEVEL_CLUES (scaled to the
+          number of cells for boards other than 9x9).
+        - clues: Explicit number of clues to keep, overrides the level.
+        - min_effort: Stop carving early once the solver needs at least this many search nodes
+          for the puzzle (the propagation engine on 9x9 boards, exact cover on larger ones).
+        - unique: Carve only cells whose removal keeps the solution unique. With False, cells
+          are blanked at random and the puzzle may have several solutions.
+        """
+        stats = instrumentation.active
+        if stats is None:
+            return self._generate(level, clues, min_effort, unique)
+        start = time.perf_counter()
+        try:
+            return self._generate(level, clues, min_effort, unique, stats)
+        finally:
+            stats.add_time('generate', time.perf_counter() - start)
+            stats.count('carve_nodes', self.carve_nodes)
+
+    def _generate(self, level, clues, min_effort, unique, stats=None):
+        self.carve_nodes = 0
+        side = self.side
+        self.grid = [[0 for _ in range(side)] for _ in range(side)]
+        self.generate_full_solution(stats)
+        self.solution = [row[:] for row in self.grid]
+        if clues is None:
+            clues = round(LEVEL_CLUES.get(level, LEVEL_CLUES['medium']) * side * side / 81)
+
+        if unique:
+            self.carve(clues, min_effort)
+        else:
+            for idx in self.rng.sample(range(side * side), side * side - clues):
+                self.grid[idx // side][idx % side] = 0
         return self.grid
+
+    def carve(self, clues=17, min_effort=None):
+        """
+        Remove cells from the full grid one at a time, in a shuffled order, keeping only the
+        removals after which the puzzle still has exactly one solution.
+
+        Stops once `clues` clues are left, the solver effort reaches `min_effort`, or every
+        cell has been tried. Returns the number of clues left.
+        """
+        if self.box_size != 3:
+            return self._carve_exact_cover(clues, min_effort)
+        counter = SolutionCounter(self.grid)
+        order = list(range(81))
+        self.rng.shuffle(order)
+        remaining = 81
+        for idx in order:
+            if remaining <= clues:
+                break
+            value = counter.remove(idx)
+            other = counter.has_other_solution(idx, value)
+            self.carve_nodes += counter.nodes
+            if other:
+                counter.place(idx, value)
+                continue
+            remaining -= 1
+            if min_effort is not None and counter.effort() >= min_effort:
+                break
+        self.grid = counter.board()
+        return remaining
+
+    def _carve_exact_cover(self, clues, min_effort=None):
+        # Boards other than 9x9: every removal is checked with a fresh exact cover count, which
+        # is much slower than the incremental 9x9 counter, so large unique puzzles take a while.
+        # The effort is the number of exact cover search nodes needed to solve the puzzle.
+        side = self.side
+        cells = flat_cells(self.grid)
+        order = list(range(side * side))
+        self.rng.shuffle(order)
+        remaining = side * side
+        for idx in order:
+            if remaining <= clues:
+                break
+            value, cells[idx] = cells[idx], 0
+            cover = dlx.ExactCover(cells)
+            other = sum(1 for _ in cover.solutions(limit=2)) > 1
+            self.carve_nodes += cover.nodes
+            if other:
+                cells[idx] = value
+                continue
+            remaining -= 1
+            if min_effort is not None:
+                cover = dlx.ExactCover(cells)
+                next(cover.solutions(limit=1))
+                if cover.nodes >= min_effort:
+                    break
+        self.grid = [cells[row * side:row * side + side] for row in range(side)]
+        return remaining
@@ -0,0 +1,45 @@
+import json
+
+
+def _jsonable(value):
+    # Nonces and digests are bytes or memoryviews, write them as hex
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    if isinstance(value, (tuple, list)):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+def record_to_dict(record):
+    """Turn any result namedtuple (OpeningRecord, RoundResult, ...) into a JSON-ready dict."""
+    return {field: _jsonable(value) for field, value in record._asdict().items()}
+
+
+def write_jsonl(records, stream, batch_size=64):
+    """
+    Write result records to `stream` as JSON lines while they are produced.
+
+    Args:
+    - records: Any iterable of result namedtuples, e.g. ZeroKnowledgeProof.stream_results() or ProofRunner.stream().
+    - stream: A text file object.
+    - batch_size: Number of lines joined into a single write and flushed together.
+
+    Returns:
+    - The number of records written.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    written = 0
+    lines = []
+    for record in records:
+        lines.append(json.dumps(record_to_dict(record), separators=(',', ':')))
+        if len(lines) == batch_size:
+            stream.write('\n'.join(lines) + '\n')
+            stream.flush()
+            written += len(lines)
+            lines.clear()
+    if lines:
+        stream.write('\n'.join(lines) + '\n')
+        stream.flush()
+        written += len(lines)
+    return written
@@ -0,0 +1,198 @@
+import dbm
+import threading
+from collections import OrderedDict, namedtuple
+from itertools import islice, permutations, product
+
+from backend.board import Board, flat_cells
+from backend.sudoku_solver import SudokuSolver, solve_copy
+
+# Equivalent puzzles tied on every clue-pattern signature are told apart by trying every tied
+# arrangement; past this many the search is cut short. The key stays deterministic, but two
+# equivalent puzzles with that much symmetry may then land on different keys (a cache miss).
+# Kept low so a highly symmetric puzzle (the empty grid) costs a few ms, not a thousand solves.
+MAX_CANDIDATES = 64
+UNSOLVABLE = b''
+
+# key: the canonical puzzle, 81 bytes. cells: cells[k] is the flat index of the original cell that
+# lands on canonical cell k. relabel: maps every original digit 1..9 to its canonical digit.
+CanonicalForm = namedtuple('CanonicalForm', ['key', 'cells', 'relabel'])
+CacheInfo = namedtuple('CacheInfo', ['hits', 'disk_hits', 'misses', 'size', 'maxsize'])
+
+
+def _line_orders(signatures):
+    """
+    All orders of the 9 lines (rows, or columns) that sort the bands, and the lines inside each
+    band, by signature. Only lines or bands with equal signatures can trade places.
+    """
+    bands = [sorted(signatures[band * 3:band * 3 + 3]) for band in range(3)]
+    band_orders = [order for order in permutations(range(3))
+                   if [bands[band] for band in order] == sorted(bands)]
+    line_orders = []
+    for band in range(3):
+        lines = range(band * 3, band * 3 + 3)
+        line_orders.append([order for order in permutations(lines)
+                            if [signatures[line] for line in order] == bands[band]])
+    for band_order in band_orders:
+        for lines in product(*(line_orders[band] for band in band_order)):
+            yield [line for order in lines for line in order]
+
+
+def _orientation(cells):
+    """Row and column signatures of a flat cell list, from its clue pattern alone."""
+    row_counts = [sum(1 for c in range(9) if cells[r * 9 + c]) for r in range(9)]
+    col_counts = [sum(1 for r in range(9) if cells[r * 9 + c]) for c in range(9)]
+    row_signatures = [(row_counts[r], sorted(col_counts[c] for c in range(9) if cells[r * 9 + c]))
+                      for r in range(9)]
+    col_signatures = [(col_counts[c], sorted(row_counts[r] for r in range(9) if cells[r * 9 + c]))
+                      for c in range(9)]
+    band_rank = sorted(sorted(row_signatures[b * 3:b * 3 + 3]) for b in range(3))
+    stack_rank = sorted(sorted(col_signatures[s * 3:s * 3 + 3]) for s in range(3))
+    return band_rank, stack_rank, row_signatures, col_signatures
+
+
+def canonical_form(puzzle):
+    """
+    Bring a puzzle into a canonical form under the Sudoku symmetry group: transposition, band and
+    stack permutations, row and column permutations inside them, and digit relabeling.
+
+    Bands, stacks, rows and columns are first ordered by invariants of the clue pattern; the
+    remaining ties are broken by taking the lexicographically smallest board, with digits
+    relabeled in order of first appearance. Equivalent puzzles therefore share the same key.
+    Only 9x9 puzzles are supported, others raise ValueError.
+    """
+    cells = flat_cells(puzzle)
+    if len(cells) != 81:
+        raise ValueError(f"The solve cache only handles 9x9 puzzles, got {len(cells)} cells")
+    transposed = [cells[c * 9 + r] for r in range(9) for c in range(9)]
+
+    oriented = []
+    for flip, grid in ((False, cells), (True, transposed)):
+        band_rank, stack_rank, row_signatures, col_signatures = _orientation(grid)
+        oriented.append(((band_rank, stack_rank), flip, grid, row_signatures, col_signatures))
+    best_rank = min(entry[0] for entry in oriented)
+
+    best = None
+    for rank, flip, grid, row_signatures, col_signatures in oriented:
+        if rank != best_rank:
+            continue
+        col_orders = list(_line_orders(col_signatures))
+        candidates = islice(product(_line_orders(row_signatures), col_orders), MAX_CANDIDATES)
+        for rows, cols in candidates:
+            order = [r * 9 + c for r in rows for c in cols]
+            relabel = {}
+            key = bytes(relabel.setdefault(value, len(relabel) + 1) if value else 0
+                        for value in (grid[idx] for idx in order))
+            if best is None or key < best[0]:
+                best = (key, order, relabel, flip)
+
+    key, order, relabel, flip = best
+    if flip:
+        order = [(idx % 9) * 9 + idx // 9 for idx in order]  # Back to indices of the untransposed puzzle
+    # Digits absent from the puzzle are interchangeable, give them the remaining labels in order
+    for digit in range(1, 10):
+        relabel.setdefault(digit, len(relabel) + 1)
+    return CanonicalForm(key, order, relabel)
+
+
+class SolveCache:
+    """
+    Memoizes solutions by canonical puzzle form, so a puzzle equivalent to one already solved
+    (relabeled, transposed, or with bands, stacks, rows or columns swapped) is answered without
+    searching: the cached canonical solution is mapped back onto the original puzzle.
+
+    Canonicalizing costs about as much as a propagate solve of a typical generated puzzle, so the
+    cache only pays off on inputs that repeat hard or equivalent puzzles; callers opt in.
+
+    The in-memory tier is an LRU bounded to `maxsize` entries. With a `path` the solutions are
+    also stored in a dbm file, which is consulted on a miss and survives restarts.
+
+    Only 9x9 puzzles are cached; solve() raises ValueError for other board sizes.
+    """
+
+    def __init__(self, maxsize=4096, path=None, engine='propagate'):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if engine not in SudokuSolver.ENGINES:
+            raise ValueError(f"Unknown solver engine {engine!r}, expected one of {SudokuSolver.ENGINES}")
+        self.maxsize = maxsize
+        self.engine = engine
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = dbm.open(path, 'c') if path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def solve(self, puzzle):
+        """
+        Return a solution of `puzzle`, or None if it has none.
+
+        The solution has the puzzle's type (Board or list-of-lists); the puzzle is left untouched.
+        """
+        form = canonical_form(puzzle)
+        solution = self._lookup(form.key)
+        if solution is None:
+            solution = self._solve(puzzle, form)
+
+        if solution == UNSOLVABLE:
+            return None
+        back = {canonical: digit for digit, canonical in form.relabel.items()}
+        cells = bytearray(81)
+        for position, idx in enumerate(form.cells):
+            cells[idx] = back[solution[position]]
+        board = Board(cells)
+        return board if isinstance(puzzle, Board) else board.to_lists()
+
+    def _lookup(self, key):
+        with self._lock:
+            solution = self._entries.get(key)
+            if solution is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return solution
+            if self._disk is not None:
+                solution = self._disk.get(key)
+                if solution is not None:
+                    self.disk_hits += 1
+                    self._store(key, solution, write_through=False)
+                    return solution
+            self.misses += 1
+            return None
+
+    def _solve(self, puzzle, form):
+        board = solve_copy(Board(flat_cells(puzzle)), self.engine)
+        if board is not None:
+            solution = bytes(form.relabel[board.cells[idx]] for idx in form.cells)
+        else:
+            solution = UNSOLVABLE
+        with self._lock:
+            self._store(form.key, solution)
+        return solution
+
+    def _store(self, key, solution, write_through=True):
+        self._entries[key] = solution
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        if write_through and self._disk is not None:
+            self._disk[key] = solution
+
+    def info(self):
+        return CacheInfo(self.hits, self.disk_hits, self.misses, len(self._entries), self.maxsize)
+
+    def clear(self):
+        """Drop the in-memory entries and reset the statistics. The disk tier is kept."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
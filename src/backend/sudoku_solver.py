@@ -1,6 +1,25 @@
+import time
+from collections import namedtuple
+
+from backend import dlx, instrumentation
+from backend.parallel import bounded_map, chunked
+from backend.board import BOX_OF, COL_OF, ROW_OF, UNITS, Board, copy_board, flat_cells
+
+ALL_DIGITS = 0x1FF  # bits 0..8 stand for the digits 1..9
+DIGIT_OF = {1 << d: d + 1 for d in range(9)}
+
+SolveResult = namedtuple('SolveResult', ['index', 'solution', 'seconds', 'nodes'])
+
+
 class SudokuSolver:
-    def __init__(self, board=None):
+    # 'backtrack' and 'propagate' handle 9x9 boards, 'dlx' (exact cover) any box size
+    ENGINES = ('backtrack', 'propagate', 'dlx')
+
+    def __init__(self, board=None, engine='backtrack', cache=None):
         self._board = board
+        self.engine = engine
+        self.cache = cache  # Optional SolveCache consulted by get_solved_board()
+        self.nodes = 0  # Search nodes visited by the last solve()
 
     @property
     def board(self):
@@ -10,6 +29,16 @@ class SudokuSolver:
     def board(self, board):
         self._board = board
 
+    @property
+    def engine(self):
+        return self._engine
+
+    @engine.setter
+    def engine(self, engine):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown solver engine {engine!r}, expected one of {self.ENGINES}")
+        self._engine = engine
+
     def find_empty(self):
         """Find an empty cell in the Sudoku board. Empty cells are represented by 0."""
         for i in range(9):
@@ -41,7 +70,41 @@ class SudokuSolver:
         return True
 
     def solve(self):
-        """Solve the Sudoku puzzle using backtracking."""
+        """Solve the Sudoku puzzle in place with the selected engine."""
+        stats = instrumentation.active
+        if stats is None:
+            return self._solve()
+        start = time.perf_counter()
+        try:
+            return self._solve(stats)
+        finally:
+            stats.add_time('solve', time.perf_counter() - start)
+            stats.count('nodes', self.nodes)
+
+    def _solve(self, stats=None):
+        self.nodes = 0
+        if self._engine == 'dlx':
+            return self._solve_dlx()
+        if len(self._board) != 9:
+            raise ValueError(f"The {self._engine!r} engine only solves 9x9 boards, use 'dlx'")
+        if self._engine == 'propagate':
+            return self._solve_propagate()
+        if isinstance(self._board, Board):
+            # The backtracker indexes cells one by one, which is cheaper on plain lists
+            board = self._board
+            self._board = board.to_lists()
+            try:
+                solved = self._solve_backtrack(stats)
+                if solved:
+                    board.cells[:] = bytes(value for row in self._board for value in row)
+            finally:
+                self._board = board
+            return solved
+        return self._solve_backtrack(stats)
+
+    def _solve_backtrack(self, stats=None):
+        """Solve the Sudoku puzzle using backtracking. With `stats`, valid() calls are counted into it."""
+        self.nodes += 1
         find = self.find_empty()
         if not find:
             return True  # Puzzle solved
@@ -49,19 +112,365 @@ class SudokuSolver:
             row, col = find
 
         for i in range(1, 10):
+            if stats is not None:
+                stats.count('candidate_checks')
             if self.valid(i, (row, col)):
                 self._board[row][col] = i
 
-                if self.solve():
+                if self._solve_backtrack(stats):
                     return True
 
                 self._board[row][col] = 0  # Backtrack
 
         return False  # Trigger backtracking
 
+    def _solve_propagate(self):
+        """
+        Solve the Sudoku puzzle using candidate bitmasks, naked/hidden single propagation
+        and minimum-remaining-values branching.
+
+        Digits are tried in ascending order, so on puzzles with a unique solution (everything
+        the generator hands out) the result is identical to the backtracking engine.
+        """
+        cells = flat_cells(self._board)
+        masks = build_masks(cells)
+        if masks is None:
+            return False  # The givens already clash
+
+        solved = self._search(cells, *masks)
+        if solved is None:
+            return False
+
+        if isinstance(self._board, Board):
+            self._board.cells[:] = bytes(solved)
+        else:
+            for idx, value in enumerate(solved):
+                self._board[ROW_OF[idx]][COL_OF[idx]] = value
+        return True
+
+    def _solve_dlx(self):
+        """Solve the board, of any box size, as an exact cover problem with Algorithm X."""
+        cover = dlx.ExactCover(flat_cells(self._board))
+        solved = next(cover.solutions(limit=1), None)
+        self.nodes = cover.nodes
+        if solved is None:
+            return False
+        if isinstance(self._board, Board):
+            self._board.cells[:] = bytes(solved)
+        else:
+            side = len(self._board)
+            for row in range(side):
+                self._board[row][:] = solved[row * side:row * side + side]
+        return True
+
+    def _search(self, cells, rows, cols, boxes):
+        """Depth-first search over propagated states. Returns the solved flat cell list or None."""
+        self.nodes += 1
+        idx = self._propagate(cells, rows, cols, boxes)
+        if idx is None:
+            return None
+        if idx < 0:
+            return cells
+
+        r, c, b = ROW_OF[idx], COL_OF[idx], BOX_OF[idx]
+        candidates = ALL_DIGITS & ~(rows[r] | cols[c] | boxes[b])
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            next_cells, next_rows, next_cols, next_boxes = cells[:], rows[:], cols[:], boxes[:]
+            next_cells[idx] = DIGIT_OF[bit]
+            next_rows[r] |= bit
+            next_cols[c] |= bit
+            next_boxes[b] |= bit
+            solved = self._search(next_cells, next_rows, next_cols, next_boxes)
+            if solved is not None:
+                return solved
+        return None
+
+    def count_solutions(self, limit=2):
+        """Count the solutions of the board, stopping as soon as `limit` have been found."""
+        self.nodes = 0
+        cells = flat_cells(self._board)
+        if len(cells) != 81:
+            cover = dlx.ExactCover(cells)
+            count = sum(1 for _ in cover.solutions(limit))
+            self.nodes = cover.nodes
+            return count
+        masks = build_masks(cells)
+        if masks is None:
+            return 0
+        return self._count(cells, *masks, limit)
+
+    def _count(self, cells, rows, cols, boxes, limit):
+        """Like _search, but keeps going until `limit` solutions have been seen."""
+        self.nodes += 1
+        idx = self._propagate(cells, rows, cols, boxes)
+        if idx is None:
+            return 0
+        if idx < 0:
+            return 1
+
+        total = 0
+        r, c, b = ROW_OF[idx], COL_OF[idx], BOX_OF[idx]
+        candidates = ALL_DIGITS & ~(rows[r] | cols[c] | boxes[b])
+        while candidates and total < limit:
+            bit = candidates & -candidates
+            candidates ^= bit
+            next_cells, next_rows, next_cols, next_boxes = cells[:], rows[:], cols[:], boxes[:]
+            next_cells[idx] = DIGIT_OF[bit]
+            next_rows[r] |= bit
+            next_cols[c] |= bit
+            next_boxes[b] |= bit
+            total += self._count(next_cells, next_rows, next_cols, next_boxes, limit - total)
+        return total
+
+    @staticmethod
+    def _propagate(cells, rows, cols, boxes):
+        """
+        Fill naked and hidden singles in place until nothing changes.
+
+        Returns None on a contradiction, -1 when the board is full, otherwise the index of
+        the empty cell with the fewest candidates.
+        """
+        while True:
+            progress = False
+            best, best_count = -1, 10
+            candidates = [0] * 81
+
+            # Naked singles: a cell with only one candidate left
+            for idx in range(81):
+                if cells[idx]:
+                    continue
+                r, c, b = ROW_OF[idx], COL_OF[idx], BOX_OF[idx]
+                cand = ALL_DIGITS & ~(rows[r] | cols[c] | boxes[b])
+                if not cand:
+                    return None
+                if not cand & (cand - 1):
+                    cells[idx] = DIGIT_OF[cand]
+                    rows[r] |= cand
+                    cols[c] |= cand
+                    boxes[b] |= cand
+                    progress = True
+                    continue
+                candidates[idx] = cand
+                if best_count > 2:
+                    count = bin(cand).count('1')
+                    if count < best_count:
+                        best, best_count = idx, count
+
+            if progress:
+                continue
+
+            # Hidden singles: a digit with only one possible place in a unit
+            for unit in UNITS:
+                once = twice = placed = 0
+                for idx in unit:
+                    if cells[idx]:
+                        placed |= 1 << (cells[idx] - 1)
+                    else:
+                        cand = candidates[idx]
+                        twice |= once & cand
+                        once |= cand
+                if (once | placed) != ALL_DIGITS:
+                    return None  # Some digit has nowhere to go in this unit
+                hidden = once & ~twice & ~placed
+                while hidden:
+                    bit = hidden & -hidden
+                    hidden ^= bit
+                    for idx in unit:
+                        if candidates[idx] & bit and not cells[idx]:
+                            break
+                    else:
+                        return None  # Two digits need the same cell
+                    r, c, b = ROW_OF[idx], COL_OF[idx], BOX_OF[idx]
+                    if (rows[r] | cols[c] | boxes[b]) & bit:
+                        return None
+                    cells[idx] = DIGIT_OF[bit]
+                    rows[r] |= bit
+                    cols[c] |= bit
+                    boxes[b] |= bit
+                    progress = True
+
+            if not progress:
+                return best
+
     def get_solved_board(self):
-        """Returns the solved board."""
+        """Returns the solved board, looked up in self.cache first when one is set (9x9 boards only)."""
+        if self.cache is not None and len(self._board) == 9:
+            solution = self.cache.solve(self._board)
+            if solution is None:
+                return None
+            if isinstance(self._board, Board):
+                self._board.cells[:] = solution.cells
+            else:
+                for row, values in zip(self._board, solution):
+                    row[:] = values
+            return self._board
         if self.solve():
             return self._board
         else:
             return None
+
+
+class SolutionCounter:
+    """
+    Early-exit solution counter for carving puzzles out of a solved grid.
+
+    The candidate bitmasks are updated in place as clues are removed or restored, so every check
+    starts from the current state instead of rebuilding it from the board.
+    """
+
+    def __init__(self, board):
+        self.cells = flat_cells(board)
+        masks = build_masks(self.cells)
+        if masks is None:
+            raise ValueError("The board breaks the Sudoku rules")
+        self.rows, self.cols, self.boxes = masks
+        self.solver = SudokuSolver(engine='propagate')
+
+    @property
+    def nodes(self):
+        return self.solver.nodes
+
+    def remove(self, idx):
+        """Empty the cell at flat index `idx` and return the value it held."""
+        value = self.cells[idx]
+        mask = ~(1 << (value - 1))
+        self.rows[ROW_OF[idx]] &= mask
+        self.cols[COL_OF[idx]] &= mask
+        self.boxes[BOX_OF[idx]] &= mask
+        self.cells[idx] = 0
+        return value
+
+    def place(self, idx, value):
+        bit = 1 << (value - 1)
+        self.rows[ROW_OF[idx]] |= bit
+        self.cols[COL_OF[idx]] |= bit
+        self.boxes[BOX_OF[idx]] |= bit
+        self.cells[idx] = value
+
+    def count(self, limit=2):
+        """Count the solutions of the current puzzle, stopping at `limit`."""
+        self.solver.nodes = 0
+        return self.solver._count(self.cells[:], self.rows[:], self.cols[:], self.boxes[:], limit)
+
+    def has_other_solution(self, idx, value):
+        """
+        Check whether the puzzle still has a solution in which cell `idx` is not `value`.
+
+        The cell must be empty and the puzzle must already be known to have a solution with
+        `value` there (true while carving a solved grid), so this is equivalent to asking
+        whether there are at least two solutions, but only the other digits are searched.
+        """
+        self.solver.nodes = 0
+        r, c, b = ROW_OF[idx], COL_OF[idx], BOX_OF[idx]
+        candidates = ALL_DIGITS & ~(self.rows[r] | self.cols[c] | self.boxes[b]) & ~(1 << (value - 1))
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            cells, rows, cols, boxes = self.cells[:], self.rows[:], self.cols[:], self.boxes[:]
+            cells[idx] = DIGIT_OF[bit]
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+            if self.solver._search(cells, rows, cols, boxes) is not None:
+                return True
+        return False
+
+    def effort(self):
+        """Number of search nodes the propagation engine needs to solve the current puzzle."""
+        self.solver.nodes = 0
+        self.solver._search(self.cells[:], self.rows[:], self.cols[:], self.boxes[:])
+        return self.solver.nodes
+
+    def board(self):
+        return [self.cells[row * 9:row * 9 + 9] for row in range(9)]
+
+
+def build_masks(cells):
+    """
+    Build the row, column and box digit bitmasks for a flat list of 81 cells.
+
+    Returns None if two givens clash.
+    """
+    rows, cols, boxes = [0] * 9, [0] * 9, [0] * 9
+    for idx, value in enumerate(cells):
+        if value:
+            bit = 1 << (value - 1)
+            r, c, b = ROW_OF[idx], COL_OF[idx], BOX_OF[idx]
+            if (rows[r] | cols[c] | boxes[b]) & bit:
+                return None
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+    return rows, cols, boxes
+
+
+_process_cache = None  # Per-process SolveCache behind cache=True, built on first use
+
+
+def _solve_one(puzzle, engine=None, cache=False):
+    """Solve a copy of `puzzle`. Returns (solution or None, search nodes); cache hits cost no nodes."""
+    global _process_cache
+    if cache and len(puzzle) == 9:
+        if _process_cache is None:
+            from backend.solve_cache import SolveCache  # solve_cache imports this module
+            _process_cache = SolveCache()
+        return _process_cache.solve(puzzle), 0
+    # The bitmask engines only know 9x9 boards, larger ones go to exact cover
+    solver = SudokuSolver(copy_board(puzzle), engine or ('propagate' if len(puzzle) == 9 else 'dlx'))
+    return (solver.board if solver.solve() else None), solver.nodes
+
+
+def solve_copy(puzzle, engine=None, cache=False):
+    """
+    Return a solution of `puzzle`, or None if it has none. The puzzle itself is left untouched.
+
+    Args:
+    - puzzle: A Board or list-of-lists board of any box size; the solution has the same type.
+    - engine: The SudokuSolver engine, None picks 'propagate' for 9x9 boards and 'dlx' otherwise.
+    - cache: Memoize 9x9 solutions by canonical form in an in-memory SolveCache kept per process.
+    """
+    return _solve_one(puzzle, engine, cache)[0]
+
+
+def _solve_chunk_item(args):
+    """Solve one puzzle in a worker process. Kept at module level so it can be pickled."""
+    index, puzzle, engine, cache = args
+    start = time.perf_counter()
+    solution, nodes = _solve_one(puzzle, engine, cache)
+    return SolveResult(index, solution, time.perf_counter() - start, nodes)
+
+
+def _solve_chunk(jobs):
+    return [_solve_chunk_item(job) for job in jobs]
+
+
+def solve_many(puzzles, workers=None, engine=None, chunksize=16, cache=False):
+    """
+    Solve many puzzles across a process pool and yield a SolveResult per puzzle in input order.
+
+    Args:
+    - puzzles: An iterable of boards (Board or list-of-lists) of any box size. The boards
+      themselves are left untouched.
+    - workers: Number of worker processes. None uses every core, 1 solves in this process.
+    - engine: The SudokuSolver engine used by the workers, None picks one per board as solve_copy does.
+    - chunksize: How many puzzles are sent to a worker per dispatch. At most two chunks per
+      worker are in flight, so the input is consumed lazily and never held as a whole.
+    - cache: Memoize 9x9 solutions in a SolveCache per worker process, see solve_copy.
+
+    Returns:
+    - A generator of SolveResult(index, solution, seconds, nodes), where solution is None for
+      unsolvable puzzles, seconds is the solve time and nodes is the search node count.
+    """
+    if engine is not None and engine not in SudokuSolver.ENGINES:
+        raise ValueError(f"Unknown solver engine {engine!r}, expected one of {SudokuSolver.ENGINES}")
+    jobs = ((index, puzzle, engine, cache) for index, puzzle in enumerate(puzzles))
+
+    if workers == 1:
+        for job in jobs:
+            yield _solve_chunk_item(job)
+        return
+
+    for results in bounded_map(_solve_chunk, chunked(jobs, chunksize), workers):
+        yield from results
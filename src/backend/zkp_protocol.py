@@ -1,15 +1,105 @@
 import hashlib
+import math
 import random
+import time
+from collections import Counter, namedtuple
+from functools import lru_cache
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
+
+from backend import instrumentation
+from backend.board import MAX_BOX_SIZE, Board, as_board, unit_tables
+from backend.merkle import MerkleTree, verify_proof
+from backend.nonce_pool import NONCE_SIZE, proof_nonces
+
+# One shared (read-only) card triple per digit, so placing the cards does not allocate 81 new lists
+CARDS = [[value] * 3 for value in range(MAX_BOX_SIZE ** 2 + 1)]
+
+# 'legacy' hashes "[v, v, v]-<decimal nonce>" strings into a dict of hex digests.
+# 'binary' hashes fixed-layout packets into one contiguous buffer of raw digests.
+COMMITMENT_MODES = ('legacy', 'binary')
+COMMITMENT_DOMAIN = b'zkp-sudoku/commitment/v1'
+DIGEST_SIZE = 32
+_COMMITMENT_HASHER = hashlib.sha256(COMMITMENT_DOMAIN)
+
+ALL_CARDS = 0x3FE  # bits 1..9 set, one per card value
+
+
+@lru_cache(maxsize=None)
+def selection_tables(box_size):
+    """
+    Precomputed tables for the units of a board with the given box size: flat cell indices,
+    (row, col) positions and a gather function that pulls the entries of a unit out of any flat
+    per-cell sequence (cards, nonces, ...). Returns (cells, positions, gather), each keyed by
+    selection type.
+    """
+    side = box_size * box_size
+    cells = dict(zip(('row', 'column', 'grid'), unit_tables(box_size)))
+    positions = {selection_type: [[divmod(idx, side) for idx in unit] for unit in units]
+                 for selection_type, units in cells.items()}
+    gather = {selection_type: [itemgetter(*unit) for unit in units] for selection_type, units in cells.items()}
+    return cells, positions, gather
+
+
+# The tables for the 27 units of the 9x9 board
+SELECTION_CELLS, SELECTION_POSITIONS, SELECTION_GATHER = selection_tables(3)
+
+# What a verifier receives: the commitments and the opened selections.
+# commitments is the legacy dict of hex digests or the binary digest buffer, depending on the mode.
+Transcript = namedtuple('Transcript', ['commitment_mode', 'commitments', 'openings'])
+Opening = namedtuple('Opening', ['selection_type', 'index', 'values', 'nonces'])
+
+# One verified opening as reported by ZeroKnowledgeProof.stream_results. `authentication` holds the
+# commitments of the opened cells, or the Merkle proof nodes when the proof has a Merkle layer.
+OpeningRecord = namedtuple('OpeningRecord', ['selection_type', 'index', 'values', 'nonces', 'authentication',
+                                             'verified'])
+
+
+def hash_cell(index, value, nonce, side=9):
+    """
+    Commitment digest for one cell in binary mode: SHA-256 over the domain tag followed by the
+    packet index byte || value byte || 32-byte nonce. The domain tag is hashed once and the
+    hasher state is reused through .copy().
+
+    Larger boards (side 16 or 25) have more cells than an index byte can count; their packets use
+    a two-byte index under a domain tag that names the board side.
+    """
+    if side == 9:
+        hasher = _COMMITMENT_HASHER.copy()
+        hasher.update(bytes((index, value)))
+    else:
+        hasher = _commitment_hasher(side).copy()
+        hasher.update(index.to_bytes(2, 'big') + bytes((value,)))
+    hasher.update(nonce)
+    return hasher.digest()
+
+
+@lru_cache(maxsize=None)
+def _commitment_hasher(side):
+    return hashlib.sha256(COMMITMENT_DOMAIN + f'/{side}x{side}'.encode())
 
 
 class ZeroKnowledgeProof:
-    def __init__(self, puzzle, solution):
+    def __init__(self, puzzle, solution, commitment='legacy', merkle=False):
+        if commitment not in COMMITMENT_MODES:
+            raise ValueError(f"Unknown commitment mode {commitment!r}, expected one of {COMMITMENT_MODES}")
+        self.commitment_mode = commitment
         self.zkp_results = {}
-        self.puzzle = puzzle  # The original puzzle (2D list)
-        self.solution = solution  # The solved puzzle (2D list)
-        self.nonces = self.generate_nonces()  # Generate nonces
+        self.puzzle = as_board(puzzle)  # The original puzzle (Board, 2D lists are converted)
+        self.solution = as_board(solution)  # The solved puzzle (Board, 2D lists are converted)
+        if len(self.puzzle) != len(self.solution):
+            raise ValueError("The puzzle and the solution must have the same size")
+        # 9 for the classic board, 16 or 25 for larger ones; every unit holds the cards 1..side
+        self.side = len(self.puzzle)
+        self.selection_cells, self.selection_positions, self.selection_gather = \
+            selection_tables(self.puzzle.box_size)
+        start = time.perf_counter()
+        self.nonces = self.generate_nonces(binary=commitment == 'binary', cells=self.side * self.side)
         self.cards = self.place_cards()  # Initialize cards based on the solution
         self.commitments = self.generate_commitments()  # Generate commitments using nonces and solution values
+        # Optional Merkle layer: publish one 32-byte root instead of the side * side commitments
+        self.merkle_tree = MerkleTree(self.commitment_digests()) if merkle else None
+        instrumentation.add_time('commit', start)
 
     @staticmethod
     def hash_packet(packet, nonce):
@@ -18,26 +108,40 @@ class ZeroKnowledgeProof:
         return hashlib.sha256(combined.encode()).hexdigest()
 
     def place_cards(self):
-        # For each cell, create a 'card' with the solution value (simulating faced down placement)
+        # For each cell, place the solution value (simulating faced down placement)
         # For filled cells in the original puzzle, we simulate faced up placement by not hiding the value
-        cards = [[None for _ in range(9)] for _ in range(9)]
-        for i in range(9):
-            for j in range(9):
-                cards[i][j] = [self.solution[i][j]] * 3 if self.puzzle[i][j] == 0 else [self.puzzle[i][j]] * 3
-        return cards
+        # The cards for a cell are CARDS[value], so the Board only needs to hold the value itself
+        return Board(given or solved for given, solved in zip(self.puzzle.cells, self.solution.cells))
 
     @staticmethod
-    def generate_nonces():
-        # Generate a nonce for each cell in a 2D list structure
-        return [[random.getrandbits(256) for _ in range(9)] for _ in range(9)]
+    def generate_nonces(binary=False, cells=81):
+        # Generate a nonce for each cell in a flat, row-major list (the nonce of cell (i, j) is at i * side + j)
+        # Every 81 nonces come from one pooled os.urandom block, larger boards take as many blocks as they
+        # need; binary nonces are zero-copy slices of them, legacy nonces are the same bytes read as
+        # 256-bit integers for the decimal packet format.
+        blocks = [proof_nonces() for _ in range(math.ceil(cells / 81))]
+        nonces = [block[offset:offset + NONCE_SIZE] for block in blocks
+                  for offset in range(0, 81 * NONCE_SIZE, NONCE_SIZE)][:cells]
+        if not binary:
+            nonces = [int.from_bytes(nonce, 'big') for nonce in nonces]
+        return nonces
 
     def generate_commitments(self):
         # Generate commitments based on solution values and nonces
+        side = self.side
+        instrumentation.count('hash_calls', side * side)
+        if self.commitment_mode == 'binary':
+            # side * side raw digests back to back, the digest of cell (i, j) starts at (i * side + j) * DIGEST_SIZE
+            cells = self.cards.cells
+            if side == 9:
+                return b''.join(hash_cell(idx, cells[idx], self.nonces[idx]) for idx in range(81))
+            return b''.join(hash_cell(idx, cells[idx], self.nonces[idx], side) for idx in range(side * side))
+
         commitments = {}
-        for i in range(9):
-            for j in range(9):
-                val = self.cards[i][j]
-                nonce = self.nonces[i][j]
+        for i in range(side):
+            for j in range(side):
+                val = CARDS[self.cards[i, j]]
+                nonce = self.nonces[i * side + j]
                 commitments[(i, j)] = self.hash_packet([val], nonce)
 
         # keep the commitments sorted by row so the console output is consistent
@@ -55,73 +159,158 @@ class ZeroKnowledgeProof:
         - A list of tuples, where each tuple contains the card value, its corresponding nonce,
           and its position (row, column) for the selected selection.
         """
-        selected_cards = []
-        if selection_type == 'row':
-            for j in range(9):  # Iterate through each column in the row
-                card = self.cards[index][j]
-                nonce = self.nonces[index][j]
-                position = (index, j)
-                selected_cards.append((card, nonce, position))
-
-        elif selection_type == 'column':
-            for i in range(9):  # Iterate through each row in the column
-                card = self.cards[i][index]
-                nonce = self.nonces[i][index]
-                position = (i, index)
-                selected_cards.append((card, nonce, position))
-
-        elif selection_type == 'grid':
-            start_row = (index // 3) * 3
-            start_col = (index % 3) * 3
-            for i in range(3):
-                for j in range(3):
-                    row = start_row + i
-                    col = start_col + j
-                    card = self.cards[row][col]
-                    nonce = self.nonces[row][col]
-                    position = (row, col)
-                    selected_cards.append((card, nonce, position))
-
-        return selected_cards
-
-    def verify_complete_selection(self, selection_type, index):
-        # Gather all selected cards for the specified selection
-        selected_cards = self.select_cards_for_selection(selection_type, index)
+        gather = self.selection_gather.get(selection_type)
+        if gather is None:
+            return []
+        values = gather[index](self.cards.cells)
+        nonces = gather[index](self.nonces)
+        return [(CARDS[value], nonce, position)
+                for value, nonce, position in zip(values, nonces, self.selection_positions[selection_type][index])]
+
+    def verify_complete_selection(self, selection_type, index, selected_cards=None):
+        # Gather all selected cards for the specified selection, unless the caller already opened it
+        if selected_cards is None:
+            selected_cards = self.select_cards_for_selection(selection_type, index)
 
         # Extract just the card values for completeness check
         card_values = [card[0] for card, _, _ in selected_cards]
 
-        # Check if all numbers from 1 to 9 are present
-        if sorted(card_values) != list(range(1, 10)):
+        # Check if all numbers from 1 to 9 (1 to side on larger boards) are present
+        if sorted(card_values) != list(range(1, self.side + 1)):
             # print(f"Verification Failed: Not all numbers from 1 to 9 are present in the {selection_type} {index}.")
             return False
 
         # Verify each card's commitment
-        for selection in selected_cards:
+        for checked, selection in enumerate(selected_cards, 1):
             if not self.verify_selection(selection):
                 # print(f"Verification Failed: Commitment mismatch for card in {selection_type} {index}.")
+                instrumentation.count('hash_calls', checked)
                 return False
+        instrumentation.count('hash_calls', len(selected_cards))
 
         # print(f"Verification Successful: All numbers from 1 to 9 are present in the {selection_type} {index}.")
         # print(f"Verification Successful: All commitments for the {selection_type} {index} are valid.")
         return True
 
+    def verify_givens(self, puzzle=None):
+        """
+        Open every cell that is filled in the puzzle and check it against its commitment.
+
+        The opened values must be a consistent one-to-one relabeling of the givens of `puzzle`
+        (self.puzzle by default), so a prover that permuted the digits still passes while a prover
+        whose cards ignore the givens does not.
+        """
+        givens = as_board(puzzle) if puzzle is not None else self.puzzle
+        relabel = {}
+        hashed = 0
+        try:
+            for idx, given in enumerate(givens.cells):
+                if not given:
+                    continue
+                value = self.cards.cells[idx]
+                if relabel.setdefault(given, value) != value:
+                    return False
+                i, j = divmod(idx, self.side)
+                hashed += 1
+                if not self.verify_selection((CARDS[value], self.nonces[idx], (i, j))):
+                    return False
+            return len(set(relabel.values())) == len(relabel)
+        finally:
+            instrumentation.count('hash_calls', hashed)
+
+    def commitment_digests(self):
+        """The cell commitments (81 on a 9x9 board) as raw 32-byte digests, in row-major order."""
+        side = self.side
+        if self.commitment_mode == 'binary':
+            return [self.commitments[offset:offset + DIGEST_SIZE]
+                    for offset in range(0, side * side * DIGEST_SIZE, DIGEST_SIZE)]
+        return [bytes.fromhex(self.commitments[(i, j)]) for i in range(side) for j in range(side)]
+
+    @property
+    def merkle_root(self):
+        return self.merkle_tree.root if self.merkle_tree else None
+
+    def verify_merkle_selection(self, selected_cards, proof_nodes):
+        """
+        Check opened cards against the Merkle root alone: recompute each opened cell's commitment
+        from its card and nonce and rebuild the root with the proof nodes.
+        """
+        side = self.side
+        leaves = {}
+        for card, nonce, (i, j) in selected_cards:
+            if self.commitment_mode == 'binary':
+                leaves[i * side + j] = hash_cell(i * side + j, card[0], nonce, side)
+            else:
+                leaves[i * side + j] = bytes.fromhex(self.hash_packet([card], nonce))
+        instrumentation.count('hash_calls', len(leaves))
+        return verify_proof(self.merkle_root, side * side, leaves, proof_nodes)
+
+    def get_commitment(self, i, j):
+        """The stored commitment of cell (i, j): a hex string in legacy mode, 32 raw bytes in binary mode."""
+        if self.commitment_mode == 'binary':
+            offset = (i * self.side + j) * DIGEST_SIZE
+            return self.commitments[offset:offset + DIGEST_SIZE]
+        return self.commitments[(i, j)]
+
     def verify_selection(self, selection):
         # Verify a single selection; this can be adapted for batch verification
         card, nonce, position = selection
         i, j = position
-        expected_commitment = self.commitments[(i, j)]
+        expected_commitment = self.get_commitment(i, j)
         # print(f"Expected Commitment: {expected_commitment}")
-        actual_commitment = self.hash_packet([card], nonce)
+        if self.commitment_mode == 'binary':
+            actual_commitment = hash_cell(i * self.side + j, card[0], nonce, self.side)
+        else:
+            actual_commitment = self.hash_packet([card], nonce)
         # print(f"Actual Commitment: {actual_commitment}")
         return expected_commitment == actual_commitment
 
+    def open_selection(self, selection_type, index):
+        """
+        Open one selection and verify it.
+
+        Returns (selected_cards, verified, authentication), where authentication is the Merkle proof
+        nodes of the opened cells if the proof has a Merkle layer, otherwise their commitments keyed by (i, j).
+        """
+        start = time.perf_counter()
+        selected_cards = self.select_cards_for_selection(selection_type, index)
+        if self.merkle_tree:
+            # Ship only the authentication nodes for the opened cells, the verifier holds the root
+            authentication = self.merkle_tree.prove([i * self.side + j for _, _, (i, j) in selected_cards])
+        else:
+            authentication = {(i, j): self.get_commitment(i, j) for _, _, (i, j) in selected_cards}
+        instrumentation.add_time('open', start)
+
+        start = time.perf_counter()
+        verified = self.verify_complete_selection(selection_type, index, selected_cards)
+        if self.merkle_tree:
+            verified = verified and self.verify_merkle_selection(selected_cards, authentication)
+        instrumentation.add_time('verify', start)
+        return selected_cards, verified, authentication
+
+    def stream_results(self, selection_types=('row', 'column', 'grid'), count=None):
+        """
+        Lazily verify `count` random selections of every type (all but one by default), yielding
+        one OpeningRecord each.
+
+        Records are produced one at a time as they are verified, so callers can render or export
+        them without holding the nested zkp_results dict in memory.
+        """
+        if count is None:
+            count = self.side - 1
+        for selection_type in selection_types:
+            for index in sorted(random.sample(range(self.side), count)):
+                selected_cards, verified, authentication = self.open_selection(selection_type, index)
+                if isinstance(authentication, dict):
+                    authentication = tuple(authentication.values())
+                yield OpeningRecord(selection_type, index, tuple(card[0] for card, _, _ in selected_cards),
+                                    tuple(nonce for _, nonce, _ in selected_cards), tuple(authentication), verified)
+
     def verfify_zkp(self, selection_type):
         # Randomly choose a row for the demonstration of ZKP
-        index = random.randint(0, 8)
-        selected_cards = self.select_cards_for_selection(selection_type, index)
-        verified = self.verify_complete_selection(selection_type, index)
-        selected_commitments = {(i, j): self.commitments[(i, j)] for _, _, (i, j) in selected_cards}
+        index = random.randint(0, self.side - 1)
+        # Open the selection once and reuse it for both verification and the report
+        selected_cards, verified, authentication = self.open_selection(selection_type, index)
 
         # Populate zkp_results with relevant information
         results = {
@@ -130,15 +319,18 @@ class ZeroKnowledgeProof:
             "selected_values": [card[0] for card, _, _ in selected_cards],  # The actual values of the selected row/column/grid
             "selected_nonces": [nonce for _, nonce, _ in selected_cards],  # The nonces used for the selected row/column/grid
             "selected_cards": selected_cards,  # Actual values of the selected row/column/grid from the solution
-            "selected_commitments": selected_commitments,
             "verification_process": "Verification Successful" if verified else "Verification Failed"
         }
+        if self.merkle_tree:
+            results["merkle_proof"] = authentication
+        else:
+            results["selected_commitments"] = authentication
 
         return results
 
     def get_results(self, selection_type):
         self.zkp_results[selection_type] = {}
-        indexes = random.sample(range(9), 8)
+        indexes = random.sample(range(self.side), self.side - 1)
         indexes = sorted(indexes)
 
         for index in indexes:
@@ -150,7 +342,151 @@ class ZeroKnowledgeProof:
 
         return self.zkp_results
 
+    def make_transcript(self, selections=None):
+        """
+        Package the commitments and the openings of `selections`, a list of (selection_type, index)
+        pairs, into a Transcript. By default all but one random index of each selection type are
+        opened (8 of 9 on a 9x9 board), the same schedule as run_zkp.
+        """
+        if selections is None:
+            selections = [(selection_type, index) for selection_type in ('row', 'column', 'grid')
+                          for index in sorted(random.sample(range(self.side), self.side - 1))]
+        start = time.perf_counter()
+        openings = []
+        for selection_type, index in selections:
+            selected_cards = self.select_cards_for_selection(selection_type, index)
+            # Binary nonces are memoryviews into the nonce pool, copy them so the transcript can be pickled
+            openings.append(Opening(selection_type, index,
+                                    bytes(card[0] for card, _, _ in selected_cards),
+                                    [nonce if isinstance(nonce, int) else bytes(nonce)
+                                     for _, nonce, _ in selected_cards]))
+        instrumentation.add_time('open', start)
+        return Transcript(self.commitment_mode, self.commitments, openings)
+
     @staticmethod
     def flatten(two_dimensional_list):
         # Utility method to flatten a 2D list into a 1D list
         return [item for sublist in two_dimensional_list for item in sublist]
+
+
+def transcript_side(transcript):
+    """
+    Side of the board a transcript commits to (9 for 9x9), from its number of commitments.
+    Returns 0 when the commitments do not describe a board of a supported size.
+    """
+    cells = len(transcript.commitments)
+    if transcript.commitment_mode == 'binary':
+        if cells % DIGEST_SIZE:
+            return 0
+        cells //= DIGEST_SIZE
+    side = math.isqrt(cells)
+    box_size = math.isqrt(side)
+    if side * side != cells or box_size * box_size != side or not 2 <= box_size <= MAX_BOX_SIZE:
+        return 0
+    return side
+
+
+def _well_formed(opening, side, binary):
+    """Whether an opening names a unit of the board and carries one nonce of the right type per cell."""
+    if opening.selection_type not in ('row', 'column', 'grid'):
+        return False
+    if not isinstance(opening.index, int) or not 0 <= opening.index < side:
+        return False
+    nonces = opening.nonces
+    if not isinstance(opening.values, (bytes, bytearray)) or len(nonces) != side:
+        return False
+    if binary:
+        return all(isinstance(nonce, (bytes, bytearray)) and len(nonce) == NONCE_SIZE for nonce in nonces)
+    return all(type(nonce) is int for nonce in nonces)
+
+
+def check_opened_values(transcript):
+    """
+    Cheap first pass: the transcript must commit to a board of a supported size and follow the
+    run_zkp schedule, side - 1 distinct indexes for each of row, column and grid (the prover picks
+    the openings, so the verifier checks it did not just repeat a good one). Every opening must
+    be well formed and hold each card value 1..9 (1..side) exactly once. Malformed transcripts
+    are rejected here, so the second pass never raises.
+    """
+    binary = transcript.commitment_mode == 'binary'
+    commitment_type = (bytes, bytearray) if binary else dict
+    if transcript.commitment_mode not in COMMITMENT_MODES or not isinstance(transcript.commitments, commitment_type):
+        return False
+    side = transcript_side(transcript)
+    if not side or len(transcript.openings) != 3 * (side - 1):
+        return False
+    all_cards = ALL_CARDS if side == 9 else (1 << (side + 1)) - 2
+    opened = set()
+    for opening in transcript.openings:
+        if not _well_formed(opening, side, binary):
+            return False
+        selection = (opening.selection_type, opening.index)
+        if selection in opened:
+            return False
+        opened.add(selection)
+        values = opening.values
+        if len(values) != side:
+            return False
+        seen = 0
+        for value in values:
+            seen |= 1 << value
+        if seen != all_cards:
+            return False
+    per_type = Counter(selection_type for selection_type, _ in opened)
+    return all(per_type[selection_type] == side - 1 for selection_type in ('row', 'column', 'grid'))
+
+
+def verify_transcript_commitments(transcript):
+    """
+    Recompute the commitment of every opened cell, stopping at the first mismatch. Expects a
+    transcript that passed check_opened_values.
+    """
+    commitments = transcript.commitments
+    binary = transcript.commitment_mode == 'binary'
+    side = transcript_side(transcript)
+    selection_cells = selection_tables(math.isqrt(side))[0]
+    hashed = 0
+    try:
+        for opening in transcript.openings:
+            cells = selection_cells[opening.selection_type][opening.index]
+            for idx, value, nonce in zip(cells, opening.values, opening.nonces):
+                hashed += 1
+                if binary:
+                    offset = idx * DIGEST_SIZE
+                    if commitments[offset:offset + DIGEST_SIZE] != hash_cell(idx, value, nonce, side):
+                        return False
+                elif commitments.get(divmod(idx, side)) != ZeroKnowledgeProof.hash_packet([CARDS[value]], nonce):
+                    return False
+        return True
+    finally:
+        instrumentation.count('hash_calls', hashed)
+
+
+def verify_batch(transcripts, workers=None, chunksize=16):
+    """
+    Verify many proof transcripts and return a list with one verdict (True/False) per transcript.
+
+    The card values of every opening are checked first with a bitmask, which rejects most bad
+    transcripts before any hashing. The commitments of the transcripts that pass are then
+    recomputed across a process pool (workers=1 verifies in this process), each transcript
+    stopping at its first mismatch.
+    """
+    start = time.perf_counter()
+    transcripts = list(transcripts)
+    verdicts = [check_opened_values(transcript) for transcript in transcripts]
+    survivors = [number for number, verdict in enumerate(verdicts) if verdict]
+
+    if workers == 1:
+        results = map(verify_transcript_commitments, (transcripts[number] for number in survivors))
+        for number, verdict in zip(survivors, results):
+            verdicts[number] = verdict
+        instrumentation.add_time('verify', start)
+        return verdicts
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(verify_transcript_commitments, (transcripts[number] for number in survivors),
+                           chunksize=chunksize)
+        for number, verdict in zip(survivors, results):
+            verdicts[number] = verdict
+    instrumentation.add_time('verify', start)
+    return verdicts
@@ -0,0 +1,210 @@
+import asyncio
+import secrets
+import struct
+
+from backend import instrumentation
+from backend.board import Board, as_board
+from backend.noninteractive import challenge_cells, check_challenge_values
+from backend.proof_runner import CHALLENGES, permuted_proof, rounds_for_soundness
+from backend.sudoku_solver import solve_copy
+from backend.zkp_protocol import DIGEST_SIZE, NONCE_SIZE, hash_cell
+
+# Every frame is: payload length (4 bytes, big-endian, counts the type byte) | type (1 byte) | payload
+#   HELLO      verifier -> prover   puzzle (81 bytes) | rounds (2 bytes)
+#   COMMIT     prover -> verifier   81 commitment digests (81 * 32 bytes)
+#   CHALLENGE  verifier -> prover   selection type (1 byte) | index (1 byte)
+#   OPEN       prover -> verifier   per opened cell: value (1 byte) | nonce (32 bytes)
+#   DONE       verifier -> prover   verdict (1 byte)
+#   ERROR      either way           UTF-8 message
+HELLO, COMMIT, CHALLENGE, OPEN, DONE, ERROR = range(1, 7)
+_FRAME_HEADER = struct.Struct('>IB')
+_HELLO = struct.Struct('>81sH')
+MAX_FRAME_SIZE = 81 * DIGEST_SIZE + 1
+MAX_ROUNDS = 4096
+SELECTION_TYPES = ('row', 'column', 'grid', 'givens')
+OPENED_CELL_SIZE = 1 + NONCE_SIZE
+
+
+class ProtocolError(Exception):
+    pass
+
+
+async def read_frame(reader, timeout):
+    """Read one frame and return (type, payload). Raises ProtocolError on oversized frames."""
+    header = await asyncio.wait_for(reader.readexactly(_FRAME_HEADER.size), timeout)
+    length, kind = _FRAME_HEADER.unpack(header)
+    if not 1 <= length <= MAX_FRAME_SIZE:
+        raise ProtocolError(f"Frame of {length} bytes is out of bounds")
+    payload = await asyncio.wait_for(reader.readexactly(length - 1), timeout)
+    if kind == ERROR:
+        raise ProtocolError(payload.decode('utf-8', 'replace'))
+    return kind, payload
+
+
+async def write_frame(writer, kind, payload=b''):
+    """Write one frame and wait for the transport buffer to drain, which applies backpressure."""
+    writer.write(_FRAME_HEADER.pack(len(payload) + 1, kind) + payload)
+    await writer.drain()
+
+
+async def _expect(reader, kind, timeout):
+    received, payload = await read_frame(reader, timeout)
+    if received != kind:
+        raise ProtocolError(f"Expected frame type {kind}, got {received}")
+    return payload
+
+
+class ProverServer:
+    """
+    Asyncio prover: for every connection it runs a fresh multi-round proof over its own puzzle.
+
+    Pass either a TCP host/port (port 0 picks a free port) or a Unix socket path. The number of
+    sessions handled at once is capped by max_sessions; connections beyond it wait their turn.
+    Every read is bounded by `timeout` seconds and a whole session by `session_timeout`, so slow
+    verifiers cannot pin a session slot, not even by sending each frame just in time.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, path=None, solve=None, max_sessions=1024, timeout=10.0,
+                 session_timeout=300.0):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.solve = solve or solve_copy  # Pass SolveCache().solve to reuse solutions across sessions
+        self.timeout = timeout
+        self.session_timeout = session_timeout
+        self.max_sessions = max_sessions
+        self._slots = None
+        self._server = None
+        self._active = set()  # Session tasks still running
+        self.sessions = 0
+
+    async def start(self):
+        self._slots = asyncio.Semaphore(self.max_sessions)
+        if self.path:
+            self._server = await asyncio.start_unix_server(self._handle, path=self.path, backlog=self.max_sessions)
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port,
+                                                      backlog=self.max_sessions)
+            self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+        # Let sessions that are finishing up (e.g. reading the final DONE) complete, so they are not
+        # cancelled mid-read when the event loop shuts down
+        if self._active:
+            await asyncio.wait(self._active, timeout=self.timeout)
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _handle(self, reader, writer):
+        task = asyncio.current_task()
+        self._active.add(task)
+        task.add_done_callback(self._active.discard)
+        async with self._slots:
+            try:
+                await asyncio.wait_for(self._session(reader, writer), self.session_timeout)
+            except (ProtocolError, asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError) as error:
+                if not writer.is_closing():
+                    try:
+                        await write_frame(writer, ERROR, (str(error) or type(error).__name__).encode())
+                    except ConnectionError:
+                        pass
+            finally:
+                writer.close()
+                self.sessions += 1
+
+    async def _session(self, reader, writer):
+        hello = await _expect(reader, HELLO, self.timeout)
+        if len(hello) != _HELLO.size:
+            raise ProtocolError("Bad HELLO")
+        puzzle_cells, rounds = _HELLO.unpack(hello)
+        if not 1 <= rounds <= MAX_ROUNDS or max(puzzle_cells) > 9:
+            raise ProtocolError("Bad HELLO")
+        puzzle = Board(puzzle_cells)
+        # A solve has no upper bound on its cost, run it in the default executor so one hard puzzle
+        # does not stall every other session. The per-round commitments stay on the loop: each is a
+        # small, fixed amount of work, and handing them to threads costs more in GIL contention.
+        solution = await asyncio.get_running_loop().run_in_executor(None, self.solve, puzzle)
+        if solution is None:
+            raise ProtocolError("The puzzle has no solution")
+
+        for _ in range(rounds):
+            zkp = permuted_proof(puzzle, solution)
+            await write_frame(writer, COMMIT, zkp.commitments)
+            kind, payload = await read_frame(reader, self.timeout)
+            if kind == DONE:
+                return  # The verifier has already made up its mind
+            if kind != CHALLENGE or len(payload) != 2:
+                raise ProtocolError("Expected a CHALLENGE")
+            selection, index = payload
+            if selection >= len(SELECTION_TYPES) or index > 8:
+                raise ProtocolError("Bad CHALLENGE")
+            challenge = (SELECTION_TYPES[selection], None if selection == 3 else index)
+            cells = challenge_cells(puzzle, challenge)
+            await write_frame(writer, OPEN, b''.join(
+                bytes((zkp.cards.cells[idx],)) + zkp.nonces[idx] for idx in cells))
+        await _expect(reader, DONE, self.timeout)
+
+
+class VerifierClient:
+    """Asyncio verifier: connects to a ProverServer and checks its proof for one puzzle."""
+
+    def __init__(self, host='127.0.0.1', port=None, path=None, timeout=10.0):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.timeout = timeout
+
+    async def verify(self, puzzle, soundness=2 ** -40):
+        """Run a full interactive proof session and return True if every round checks out."""
+        puzzle = as_board(puzzle)
+        rounds = rounds_for_soundness(soundness)
+        if self.path:
+            connect = asyncio.open_unix_connection(self.path)
+        else:
+            connect = asyncio.open_connection(self.host, self.port)
+        reader, writer = await asyncio.wait_for(connect, self.timeout)
+        try:
+            await write_frame(writer, HELLO, _HELLO.pack(bytes(puzzle.cells), rounds))
+            verdict = True
+            for _ in range(rounds):
+                commitments = await _expect(reader, COMMIT, self.timeout)
+                if len(commitments) != 81 * DIGEST_SIZE:
+                    raise ProtocolError("Bad COMMIT")
+                challenge = secrets.choice(CHALLENGES)
+                selection = SELECTION_TYPES.index(challenge[0])
+                await write_frame(writer, CHALLENGE, bytes((selection, challenge[1] or 0)))
+                opened = await _expect(reader, OPEN, self.timeout)
+                if not self._check_opening(puzzle, challenge, commitments, opened):
+                    verdict = False
+                    break
+            await write_frame(writer, DONE, bytes((verdict,)))
+            return verdict
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _check_opening(puzzle, challenge, commitments, opened):
+        cells = challenge_cells(puzzle, challenge)
+        if len(opened) != len(cells) * OPENED_CELL_SIZE:
+            return False
+        values = opened[::OPENED_CELL_SIZE]
+        if not check_challenge_values(puzzle, challenge, values):
+            return False
+        hashed = 0
+        try:
+            for position, idx in enumerate(cells):
+                start = position * OPENED_CELL_SIZE
+                hashed += 1
+                digest = hash_cell(idx, values[position], opened[start + 1:start + OPENED_CELL_SIZE])
+                if commitments[idx * DIGEST_SIZE:(idx + 1) * DIGEST_SIZE] != digest:
+                    return False
+            return True
+        finally:
+            instrumentation.count('hash_calls', hashed)
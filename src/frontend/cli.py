@@ -0,0 +1,280 @@
+"""
+Headless command line for batch pipelines over line-oriented puzzle files.
+
+Every line holds space-separated fields, the first one always being the puzzle in 81-character
+form ('.' or '0' for an empty cell; solve also takes 256 or 625-character 16x16 and 25x25 boards):
+  generate  writes  <puzzle> [<solution>]
+  solve     reads   <puzzle> ...                writes <puzzle> <solution>, '-' if unsolvable
+  prove     reads   <puzzle> [<solution>]       writes <puzzle> <proof as hex>
+  verify    reads   <puzzle> <proof as hex>     writes <puzzle> accepted|rejected
+Without a subcommand the interactive console is started; its UI libraries are only imported then.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict, deque
+
+current_script_path = os.path.abspath(__file__)
+project_root_path = os.path.dirname(os.path.dirname(os.path.dirname(current_script_path)))
+src_path = os.path.join(project_root_path, 'src')
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from backend.board import Board
+from backend.noninteractive import prove, verify
+from backend.puzzle_generator import LEVEL_CLUES, PuzzleGenerator
+from backend.parallel import bounded_map, chunked
+from backend.sudoku_solver import solve_copy, solve_many
+
+UNSOLVED = '-'
+
+
+# region Stage workers, module level so they can be pickled
+
+def generate_chunk(job):
+    """Generate `count` puzzles with their own seeded generator. Returns (lines, stage seconds)."""
+    level, count, seed, mode, with_solutions = job
+    generator = PuzzleGenerator(mode, seed)
+    lines = []
+    start = time.perf_counter()
+    for _ in range(count):
+        puzzle = Board.from_lists(generator.generate(level)).to_string()
+        if with_solutions:
+            puzzle += ' ' + Board.from_lists(generator.solution).to_string()
+        lines.append(puzzle)
+    return lines, {'generate': time.perf_counter() - start}
+
+
+def prove_chunk(job):
+    lines, soundness, merkle, cache = job
+    proved = []
+    seconds = defaultdict(float)
+    for line in lines:
+        fields = line.split()
+        try:
+            puzzle = Board.from_string(fields[0])
+            start = time.perf_counter()
+            if len(fields) > 1 and fields[1] != UNSOLVED:
+                solution = Board.from_string(fields[1])
+            else:
+                solution = solve_copy(puzzle, cache=cache)
+            seconds['solve'] += time.perf_counter() - start
+            if solution is None:
+                proved.append(f"{puzzle.to_string()} {UNSOLVED}")
+                continue
+            start = time.perf_counter()
+            proof = prove(puzzle, solution, soundness, merkle)
+            seconds['prove'] += time.perf_counter() - start
+        except ValueError:
+            proved.append(f"{fields[0]} {UNSOLVED}")  # Malformed line, or a board proofs do not support
+            continue
+        proved.append(f"{puzzle.to_string()} {proof.hex()}")
+    return proved, seconds
+
+
+def verify_chunk(job):
+    lines, soundness = job
+    verdicts = []
+    start = time.perf_counter()
+    for line in lines:
+        fields = line.split()
+        try:
+            puzzle = Board.from_string(fields[0])
+            accepted = len(fields) > 1 and verify(puzzle, bytes.fromhex(fields[1]), soundness)
+        except ValueError:
+            accepted = False  # Not a 9x9 puzzle, or not even valid hex
+        verdicts.append(f"{fields[0]} {'accepted' if accepted else 'rejected'}")
+    return verdicts, {'verify': time.perf_counter() - start}
+# endregion
+
+
+class StageTimes:
+    """Accumulates seconds per pipeline stage; worker stages add up CPU time across processes."""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+
+    def add(self, stage, seconds):
+        self.seconds[stage] += seconds
+
+    def merge(self, seconds):
+        for stage, value in seconds.items():
+            self.seconds[stage] += value
+
+    def timed(self, stage, iterable):
+        """Yield from iterable, charging the time spent producing each item to `stage`."""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.seconds[stage] += time.perf_counter() - start
+                return
+            self.seconds[stage] += time.perf_counter() - start
+            yield item
+
+
+def read_lines(stream):
+    """Puzzle lines from a text stream, skipping blank lines and '#' comments. Read lazily."""
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+
+def run_stage(name, func, jobs, output, workers, failure):
+    """
+    Map func over the chunk jobs in a worker pool, write the lines to `output` and print the timing summary.
+
+    func returns (lines, {stage: seconds}). Lines ending in the `failure` field are counted as failed.
+    Returns (lines written, failed lines).
+    """
+    times = StageTimes()
+    return write_stage(name, bounded_map(func, times.timed('read', jobs), workers), output, failure, times)
+
+
+def write_stage(name, batches, output, failure, times):
+    """Write (lines, {stage: seconds}) batches to `output` and print the timing summary to stderr."""
+    count = 0
+    failed = 0
+    start = time.perf_counter()
+    for lines, seconds in batches:
+        times.merge(seconds)
+        write_start = time.perf_counter()
+        output.write('\n'.join(lines) + '\n')
+        times.add('write', time.perf_counter() - write_start)
+        count += len(lines)
+        failed += sum(line.endswith(' ' + failure) for line in lines)
+    output.flush()
+    elapsed = time.perf_counter() - start
+
+    rate = count / elapsed if elapsed else float('inf')
+    print(f"{name}: {count} puzzles in {elapsed:.2f}s ({rate:,.1f} puzzles/s)", file=sys.stderr)
+    for stage, seconds in times.seconds.items():
+        per_item = f"  {seconds / count * 1000:9.3f} ms/puzzle" if count else ""
+        print(f"  {stage:<9} {seconds:9.3f}s{per_item}", file=sys.stderr)
+    if failed:
+        print(f"  failed    {failed} puzzles", file=sys.stderr)
+    return count, failed
+
+
+def cmd_generate(args):
+    jobs = ((args.level, min(args.chunksize, args.count - start),
+             None if args.seed is None else args.seed + start, args.mode, args.solutions)
+            for start in range(0, args.count, args.chunksize))
+    run_stage('generate', generate_chunk, jobs, args.output, args.workers, UNSOLVED)
+    return 0
+
+
+def cmd_solve(args):
+    times = StageTimes()
+    pending = deque()  # (text, puzzle or None) per line read but not written yet, in input order
+
+    def puzzles():
+        for line in times.timed('read', read_lines(args.input)):
+            text = line.split()[0]
+            try:
+                puzzle = Board.from_string(text)
+            except ValueError:
+                puzzle = None  # Not a board of any supported size, written as unsolved in its place
+            pending.append((text, puzzle))
+            if puzzle is not None:
+                yield puzzle
+
+    def unparsed():
+        lines = []
+        while pending and pending[0][1] is None:
+            lines.append(f"{pending.popleft()[0]} {UNSOLVED}")
+        return lines
+
+    def batches():
+        for result in solve_many(puzzles(), args.workers, chunksize=args.chunksize, cache=args.cache):
+            lines = unparsed()
+            puzzle = pending.popleft()[1]
+            solution = result.solution.to_string() if result.solution else UNSOLVED
+            lines.append(f"{puzzle.to_string()} {solution}")
+            yield lines, {'solve': result.seconds}
+        lines = unparsed()
+        if lines:
+            yield lines, {}
+
+    _, failed = write_stage('solve', batches(), args.output, UNSOLVED, times)
+    return 1 if failed else 0
+
+
+def cmd_prove(args):
+    soundness = 2.0 ** -args.soundness_bits
+    jobs = ((lines, soundness, not args.flat, args.cache) for lines in chunked(read_lines(args.input), args.chunksize))
+    _, failed = run_stage('prove', prove_chunk, jobs, args.output, args.workers, UNSOLVED)
+    return 1 if failed else 0
+
+
+def cmd_verify(args):
+    soundness = 2.0 ** -args.soundness_bits
+    jobs = ((lines, soundness) for lines in chunked(read_lines(args.input), args.chunksize))
+    _, failed = run_stage('verify', verify_chunk, jobs, args.output, args.workers, 'rejected')
+    return 1 if failed else 0
+
+
+def cmd_interactive(args):
+    # Rich, prompt_toolkit and keyboard are only needed here, keep them off the batch path
+    from frontend.console_interface import ConsoleInterface
+    ConsoleInterface().run()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="ZKP Sudoku batch pipelines.")
+    parser.set_defaults(func=cmd_interactive)
+    subparsers = parser.add_subparsers(title="commands")
+
+    def add_command(name, func, help_text, reads_input=True, chunksize=16):
+        command = subparsers.add_parser(name, help=help_text)
+        command.set_defaults(func=func)
+        if reads_input:
+            command.add_argument('-i', '--input', type=argparse.FileType('r'), default='-',
+                                 help="puzzle line file, '-' for stdin (default)")
+        command.add_argument('-o', '--output', type=argparse.FileType('w'), default='-',
+                             help="output line file, '-' for stdout (default)")
+        command.add_argument('-w', '--workers', type=int, default=None,
+                             help="worker processes, default every core, 1 runs inline")
+        command.add_argument('--chunksize', type=int, default=chunksize, help="puzzles per worker job")
+        return command
+
+    generate = add_command('generate', cmd_generate, "generate puzzles", reads_input=False)
+    generate.add_argument('-n', '--count', type=int, default=100)
+    generate.add_argument('--level', choices=sorted(LEVEL_CLUES), default='medium')
+    generate.add_argument('--mode', choices=PuzzleGenerator.MODES, default='backtrack')
+    generate.add_argument('--seed', type=int, default=None, help="base seed, makes the output reproducible")
+    generate.add_argument('--solutions', action='store_true', help="append the solution to every line")
+
+    cache_help = "memoize solutions by canonical form, pays off when inputs repeat equivalent hard puzzles"
+    solve_command = add_command('solve', cmd_solve, "solve puzzles")
+    solve_command.add_argument('--cache', action='store_true', help=cache_help)
+
+    prove_command = add_command('prove', cmd_prove, "build non-interactive proofs", chunksize=1)
+    prove_command.add_argument('--soundness-bits', type=int, default=40,
+                               help="soundness error of 2^-bits (default 40)")
+    prove_command.add_argument('--flat', action='store_true',
+                               help="ship all 81 commitments per round instead of Merkle proofs")
+    prove_command.add_argument('--cache', action='store_true', help=cache_help)
+
+    verify_command = add_command('verify', cmd_verify, "verify non-interactive proofs", chunksize=1)
+    verify_command.add_argument('--soundness-bits', type=int, default=40,
+                                help="reject proofs with fewer rounds than 2^-bits needs (default 40)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    for name in ('count', 'chunksize', 'workers', 'soundness_bits'):
+        value = getattr(args, name, None)
+        if value is not None and value < 1:
+            raise SystemExit(f"--{name.replace('_', '-')} must be at least 1")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
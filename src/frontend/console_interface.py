@@ -1,3 +1,4 @@
+import asyncio
 import time
 import random
 
@@ -30,16 +31,16 @@ src_path = os.path.join(project_root_path, 'src')
 if src_path not in sys.path:
     sys.path.append(src_path)
 
-from backend.puzzle_generator import PuzzleGenerator  # Ensure PuzzleGenerator is correctly implemented
-from backend.sudoku_solver import SudokuSolver  # Ensure PuzzleGenerator is correctly implemented
+from backend.puzzle_bank import PuzzleBank
 from backend.zkp_protocol import ZeroKnowledgeProof  # Ensure ZKPSudoku is correctly implemented
+from backend.zkp_service import ProverServer, VerifierClient
 
 
 class ConsoleInterface:
     def __init__(self):
         self.console = Console()
-        self.puzzle_generator = PuzzleGenerator()
-        self.sudoku_solver = SudokuSolver()
+        self.puzzle_bank = PuzzleBank(os.path.join(project_root_path, 'data', 'puzzle_bank.bin'))
+        self.puzzle_bank.start()  # Keep every difficulty stocked in the background
         self.running = True  # To manage the application's running state
 
     # region Puzzle and ZKP Verification Display
@@ -64,64 +65,71 @@ class ConsoleInterface:
 
     def run_zkp_verification(self, puzzle, solution, proof_type=None):
         zkp = ZeroKnowledgeProof(puzzle, solution)
-        zkp_results = zkp.run_zkp()
+        selection_types = (proof_type,) if proof_type else ('row', 'column', 'grid')
 
         self.console.print("\nVerification of 8/9 Random Selections", style="bold salmon1")
-
-        if proof_type:
-            proof_data = zkp_results.get(proof_type, {})  # Get the specified proof_type data or empty dict if not found
-            self.print_nested_dict({proof_type: proof_data})
-        else:
-            self.print_nested_dict(zkp_results)
-
+        self.print_opening_records(zkp.stream_results(selection_types), merkle=zkp.merkle_tree is not None)
         self.console.print("\nVerification Process:", style="bold salmon1")
 
-    def print_nested_dict(self, dictionary):
-        for selection_type, selection_results in dictionary.items():
-            self.console.print(f"{selection_type.capitalize()} Selections:", style="bold salmon1")
-            for index, results in selection_results.items():
-                # highlight the self.console.print(f"Index: {index}")
-                self.console.print(f"Index: {index}", highlight=True)
-
-                self.console.print(f"Selected Values: {results['selected_values']}")
-                self.console.print(f"Selected Nonces:", style="bold salmon1")
-                for nonce in results["selected_nonces"]:
-                    self.console.print(f"  - {nonce}")
-                self.print_dict("Selected Commitments", results["selected_commitments"], index)
-                if results['verification_process'] == "Verification Successful":
-                    color = "green"
-                else:
-                    color = "red"
-
-                self.console.print(f"Verification Process: {results['verification_process']}", style=color)
-                self.console.print("\n")
-
-    def print_dict(self, description, dictionary, index=None):
-        self.console.print(f"{description}:", style="bold salmon1")
-        for (row, col), dic in dictionary.items():
-            # index += 1
-            col += 1
-            self.console.print(f"({index}, {col}): {dic}")
+    def print_opening_records(self, records, merkle=False, batch_size=4):
+        # Render the records as they are verified, one console.print per batch instead of per line
+        batch = Text()
+        selection_type = None
+        for count, record in enumerate(records, 1):
+            if record.selection_type != selection_type:
+                selection_type = record.selection_type
+                batch.append(f"{selection_type.capitalize()} Selections:\n", style="bold salmon1")
+            batch.append(f"Index: {record.index}\n")
+            batch.append(f"Selected Values: {list(record.values)}\n")
+            batch.append("Selected Nonces:\n", style="bold salmon1")
+            for nonce in record.nonces:
+                batch.append(f"  - {nonce}\n")
+            if not merkle:
+                batch.append("Selected Commitments:\n", style="bold salmon1")
+                for col, commitment in enumerate(record.authentication, 1):
+                    batch.append(f"({record.index}, {col}): {commitment}\n")
+            else:
+                batch.append(f"Merkle Proof: {len(record.authentication)} nodes\n", style="bold salmon1")
+            if record.verified:
+                batch.append("Verification Process: Verification Successful\n\n", style="green")
+            else:
+                batch.append("Verification Process: Verification Failed\n\n", style="red")
+            if count % batch_size == 0:
+                self.console.print(batch, end="")
+                batch = Text()
+        if batch:
+            self.console.print(batch, end="")
 
     # endregion
 
     def interactive_mode(self):
         self.console.print("Interactive mode selected.", style="bold green")
-        self.console.print("We do like to implement in future an interactive mode so:\nVeronica are Verifier and Pole "
-                           "are the Proover.", style="bold green")
+        self.console.print("Veronica is the Verifier and Pole is the Prover, talking over a local socket.",
+                           style="bold green")
+        puzzle, _ = self.puzzle_bank.take(random.choice(["easy", "medium", "hard"]))
+        self.display_puzzle(puzzle)
+
+        async def session():
+            async with ProverServer() as server:
+                return await VerifierClient(port=server.port).verify(puzzle)
+
+        start = time.perf_counter()
+        verified = asyncio.run(session())
+        elapsed = time.perf_counter() - start
+        if verified:
+            self.console.print(f"Veronica accepted Pole's proof in {elapsed:.2f}s", style="green")
+        else:
+            self.console.print(f"Veronica rejected Pole's proof after {elapsed:.2f}s", style="red")
         self.return_to_menu()
 
     def semi_automatic_mode(self):
         try:
             self.console.print("Semi-automatic mode selected.", style="bold green")
             difficulty = Prompt.ask("Enter the difficulty level (Easy, Medium, Hard)")
-            puzzle = self.puzzle_generator.generate(difficulty.lower())
+            puzzle, solution = self.puzzle_bank.take(difficulty.lower())
             # notify user that the puzzle is ready
             self.display_puzzle(puzzle)
 
-            self.sudoku_solver.board = puzzle
-            self.sudoku_solver.solve()
-            solution = self.sudoku_solver.get_solved_board()
             sol = Confirm.ask("Do you want to see the solution?")
             if sol:
                 self.display_puzzle(solution)
@@ -160,17 +168,14 @@ class ConsoleInterface:
         self.console.print("Automatic mode selected.", style="bold green")
         # difficulty random from Easy, Medium, Hard
         difficulty = random.choice(["easy", "medium", "hard"])
-        puzzle = self.puzzle_generator.generate(difficulty.lower())
-        self.sudoku_solver.board = puzzle
-        self.sudoku_solver.solve()
-
-        solution = self.sudoku_solver.get_solved_board()
+        puzzle, solution = self.puzzle_bank.take(difficulty)
         self.display_puzzle(puzzle)
         self.run_zkp_verification(puzzle, solution)
         self.return_to_menu()
 
     def exit_program(self):
         self.running = False
+        self.puzzle_bank.close()
         self.console.print("Exiting the program...", style="bold blue")
         sys.exit()
 
@@ -0,0 +1,63 @@
+import pytest
+
+from backend.board import Board
+from backend.noninteractive import prove, verify
+from backend.puzzle_generator import PuzzleGenerator
+from backend.sudoku_solver import SudokuSolver
+
+
+@pytest.fixture(scope='module')
+def pair():
+    puzzle = Board.from_lists(PuzzleGenerator(seed=2).generate('hard'))
+    solution = puzzle.copy()
+    assert SudokuSolver(solution, 'propagate').solve()
+    return puzzle, solution
+
+
+@pytest.fixture(scope='module')
+def proof(pair):
+    return prove(*pair, merkle=False)
+
+
+def invalid_solution(puzzle, solution):
+    """The solution with two non-given cells of row 0 swapped, still consistent with the givens."""
+    forged = solution.copy()
+    first, second = [col for col in range(9) if not puzzle[0, col]][:2]
+    forged[0, first], forged[0, second] = solution[0, second], solution[0, first]
+    return forged
+
+
+def test_honest_proof_is_accepted(pair, proof):
+    assert verify(pair[0], proof)
+
+
+def test_merkle_proof_is_accepted(pair):
+    assert verify(pair[0], prove(*pair, soundness=2 ** -10), soundness=2 ** -10)
+
+
+def test_low_round_proof_is_rejected_by_default(pair):
+    # A 1-round proof of an invalid solution passes its own round most of the time, the verifier
+    # must not let the proof header pick the soundness
+    puzzle, solution = pair
+    forged = invalid_solution(puzzle, solution)
+    for _ in range(20):
+        assert not verify(puzzle, prove(puzzle, forged, soundness=0.97))
+    assert not verify(puzzle, prove(puzzle, solution, soundness=2 ** -10))
+
+
+def test_tampered_proof_is_rejected(pair, proof):
+    for offset in (10, len(proof) // 2, len(proof) - 1):
+        tampered = bytearray(proof)
+        tampered[offset] ^= 1
+        assert not verify(pair[0], bytes(tampered))
+
+
+def test_truncated_proof_is_rejected(pair, proof):
+    for length in (0, 8, len(proof) // 2, len(proof) - 1):
+        assert not verify(pair[0], proof[:length])
+    assert not verify(pair[0], proof + b'\0')
+
+
+def test_proof_for_another_puzzle_is_rejected(pair, proof):
+    other = Board.from_lists(PuzzleGenerator(seed=3).generate('hard'))
+    assert not verify(other, proof)
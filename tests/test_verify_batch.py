@@ -0,0 +1,100 @@
+import pytest
+
+from backend.puzzle_generator import PuzzleGenerator
+from backend.sudoku_solver import SudokuSolver
+from backend.zkp_protocol import (Opening, ZeroKnowledgeProof, check_opened_values, verify_batch,
+                                  verify_transcript_commitments)
+
+
+@pytest.fixture(scope='module')
+def pair():
+    puzzle = PuzzleGenerator(seed=1).generate('medium')
+    solver = SudokuSolver([row[:] for row in puzzle])
+    assert solver.solve()
+    return puzzle, solver.board
+
+
+def transcript(pair, mode):
+    return ZeroKnowledgeProof(*pair, commitment=mode).make_transcript()
+
+
+def verdict(candidate):
+    return verify_batch([candidate], workers=1)[0]
+
+
+@pytest.mark.parametrize('mode', ['legacy', 'binary'])
+def test_honest_transcript_is_accepted(pair, mode):
+    assert verdict(transcript(pair, mode))
+
+
+def replace_first(honest, opening):
+    """The honest transcript with its first opening swapped out, so the schedule stays intact."""
+    return honest._replace(openings=[opening] + honest.openings[1:])
+
+
+@pytest.mark.parametrize('mode', ['legacy', 'binary'])
+def test_forged_openings_are_rejected(pair, mode):
+    honest = transcript(pair, mode)
+    first = honest.openings[0]
+    forged = [
+        # No nonces at all: nothing would be hashed
+        first._replace(values=bytes(range(1, 10)), nonces=[]),
+        # One nonce short
+        first._replace(nonces=first.nonces[:-1]),
+        # Nonces of the other commitment mode
+        first._replace(nonces=[1] * 9 if mode == 'binary' else [bytes(32)] * 9),
+        # Values as a list instead of bytes
+        first._replace(values=list(first.values)),
+    ]
+    for opening in forged:
+        assert not verdict(replace_first(honest, opening))
+
+
+@pytest.mark.parametrize('mode', ['legacy', 'binary'])
+def test_malformed_transcripts_are_rejected_without_raising(pair, mode):
+    honest = transcript(pair, mode)
+    opening = honest.openings[0]
+    malformed = [
+        honest._replace(openings=[]),
+        replace_first(honest, opening._replace(index=9)),
+        replace_first(honest, opening._replace(index=-1)),
+        replace_first(honest, opening._replace(index='0')),
+        replace_first(honest, opening._replace(selection_type='diagonal')),
+        honest._replace(commitment_mode='sha1'),
+        honest._replace(commitments=honest.commitments[:-1] if mode == 'binary' else {}),
+    ]
+    for candidate in malformed:
+        assert not check_opened_values(candidate)
+    assert verify_batch(malformed, workers=1) == [False] * len(malformed)
+
+
+def test_tampered_commitment_is_rejected(pair):
+    selections = [(selection_type, index) for selection_type in ('row', 'column', 'grid') for index in range(8)]
+    honest = ZeroKnowledgeProof(*pair, commitment='binary').make_transcript(selections)
+    assert verify_transcript_commitments(honest)
+    commitments = bytearray(honest.commitments)
+    commitments[0] ^= 1  # The commitment of cell 0, opened by row 0
+    tampered = honest._replace(commitments=bytes(commitments))
+    assert check_opened_values(tampered)
+    assert not verify_transcript_commitments(tampered)
+
+
+def test_bad_transcript_does_not_spoil_the_batch(pair):
+    honest = transcript(pair, 'binary')
+    bad = replace_first(honest, honest.openings[0]._replace(index=99))
+    assert verify_batch([honest, bad, honest], workers=2) == [True, False, True]
+
+
+def test_opening_schedule_is_enforced(pair):
+    # A board of 1s except for a valid row 0: repeating the one good opening must not pass
+    puzzle, solution = pair
+    forged = [list(solution[0])] + [[1] * 9 for _ in range(8)]
+    zkp = ZeroKnowledgeProof([[0] * 9 for _ in range(9)], forged, commitment='binary')
+    assert not verdict(zkp.make_transcript([('row', 0)] * 5))
+    assert not verdict(zkp.make_transcript([('row', 0)] * 24))
+
+    zkp = ZeroKnowledgeProof(*pair, commitment='binary')
+    all_rows = [('row', index) for index in range(9)]
+    assert not verdict(zkp.make_transcript(all_rows + [('column', index) for index in range(7)]
+                                           + [('grid', index) for index in range(8)]))
+    assert not verdict(zkp.make_transcript([('row', 0), ('column', 0)]))